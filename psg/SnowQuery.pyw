@@ -1,16 +1,25 @@
 from SnowQueryModel import Model
+from SnowQueryOptions import parse_options
 from SnowQueryView import View
 from SnowQueryPresenter import Presenter
 
 def main():
     ''' Initialize model, view, and presenter and show window '''
 
-    model = Model()
+    options = parse_options()
+    model = Model(
+        metadata_source=options.metadata_source,
+        metadata_mode=options.metadata_mode,
+        fan_out_databases=options.fan_out_databases
+    )
     view = View()
-    Presenter(model, view)
+    Presenter(model, view, lazy_load=options.lazy_load)
 
-    # Show window and begin event loop
-    view.show()
+    # Show window and begin event loop, cancelling running queries on exit
+    try:
+        view.show()
+    finally:
+        model.close()
 
 if __name__ == '__main__':
     main()
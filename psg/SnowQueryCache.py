@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+class Cache:
+
+    # Layout version of cached schema object lists; older entries are dropped
+    version = 3
+
+    def __init__(self, frontend, cache_file=None, ttl=24 * 60 * 60):
+        ''' Open local metadata cache of the frontend '''
+        if cache_file is None:
+            cache_file = Path.home() / '.snowquery' / f'metadata_cache_{frontend}.db'
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+
+        # Cached entries older than ttl seconds are ignored
+        self.ttl = ttl
+
+        # Connection is shared with the tree building threads
+        self.lock = threading.Lock()
+        self.cnxn = sqlite3.connect(cache_file, check_same_thread=False)
+        with self.lock, self.cnxn:
+            if self.cnxn.execute("pragma user_version").fetchone()[0] != self.version:
+                self.cnxn.execute("drop table if exists schema_objects")
+                self.cnxn.execute(f"pragma user_version = {self.version}")
+            self.cnxn.execute("""
+                create table if not exists schema_objects (
+                    account     text not null,
+                    role        text not null,
+                    node_level  text not null,
+                    scope       text not null,
+                    cached_at   real not null,
+                    schema_object_list text not null,
+                    primary key (account, role, node_level, scope)
+                )""")
+            self.cnxn.execute("""
+                create table if not exists strategies (
+                    account     text not null,
+                    role        text not null,
+                    scope_level text not null,
+                    strategy    text not null,
+                    primary key (account, role, scope_level)
+                )""")
+            self.cnxn.execute("""
+                create table if not exists signatures (
+                    account     text not null,
+                    role        text not null,
+                    node_level  text not null,
+                    scope       text not null,
+                    signatures  text not null,
+                    primary key (account, role, node_level, scope)
+                )""")
+
+    def close(self):
+        ''' Close local metadata cache '''
+        with self.lock:
+            self.cnxn.close()
+
+    def get(self, account, role, node_level, scope):
+        ''' Get cached schema object list, or None if missing or expired '''
+        with self.lock:
+            row = self.cnxn.execute("""
+                select cached_at, schema_object_list
+                from schema_objects
+                where account = ? and role = ? and node_level = ? and scope = ?""",
+                (account, role, node_level, scope)
+            ).fetchone()
+        if row is None:
+            return None
+        cached_at, schema_object_list = row
+        if time.time() - cached_at > self.ttl:
+            return None
+        return json.loads(schema_object_list)
+
+    def put(self, account, role, node_level, scope, schema_object_list):
+        ''' Save schema object list in the cache '''
+        with self.lock, self.cnxn:
+            self.cnxn.execute("""
+                insert or replace into schema_objects
+                values (?, ?, ?, ?, ?, ?)""",
+                (account, role, node_level, scope, time.time(), json.dumps(schema_object_list))
+            )
+
+    def get_signatures(self, account, role, node_level, scope):
+        ''' Get metadata signatures saved for the scope, or None '''
+        with self.lock:
+            row = self.cnxn.execute("""
+                select signatures
+                from signatures
+                where account = ? and role = ? and node_level = ? and scope = ?""",
+                (account, role, node_level, scope)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put_signatures(self, account, role, node_level, scope, signatures):
+        ''' Save metadata signatures for the scope '''
+        with self.lock, self.cnxn:
+            self.cnxn.execute("""
+                insert or replace into signatures
+                values (?, ?, ?, ?, ?)""",
+                (account, role, node_level, scope, json.dumps(signatures))
+            )
+
+    def get_strategies(self, account, role):
+        ''' Get saved metadata strategy names by scope level '''
+        with self.lock:
+            rows = self.cnxn.execute("""
+                select scope_level, strategy
+                from strategies
+                where account = ? and role = ?""",
+                (account, role)
+            ).fetchall()
+        return dict(rows)
+
+    def put_strategy(self, account, role, scope_level, strategy):
+        ''' Save the metadata strategy for a scope level '''
+        with self.lock, self.cnxn:
+            self.cnxn.execute("""
+                insert or replace into strategies
+                values (?, ?, ?, ?)""",
+                (account, role, scope_level, strategy)
+            )
@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+import threading
+import time
+
+class ConcurrencyLimiter:
+    ''' Additive increase, multiplicative decrease limit on concurrent metadata queries '''
+
+    def __init__(self, max_limit, backoff_errors=(), min_limit=1, initial_limit=None):
+        ''' Start at initial_limit concurrent queries, or max_limit if not given, kept between
+            min_limit and max_limit; backoff_errors are the throttling and transient errors
+            that signal overload '''
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        if initial_limit is None:
+            initial_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.backoff_errors = backoff_errors
+
+        # Queries currently holding a slot
+        self.in_flight = 0
+
+        # Latency is flat while the smoothed latency of a kind of query stays
+        # within latency_tolerance times the lowest smoothed latency seen for
+        # that kind, so slow kinds of query are not compared with fast ones
+        self.latency_tolerance = 2.0
+        self.smoothing = 0.2
+        self.smoothed_latency = {}
+        self.baseline_latency = {}
+
+        # Limit is multiplied by backoff on an overload error or rising latency
+        self.backoff = 0.5
+
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, kind=None):
+        ''' Hold a query slot for the duration of the block, adjusting the limit from its outcome '''
+        self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        except self.backoff_errors:
+            self.release(kind, error=True)
+            raise
+        except Exception:
+            # Other errors, such as a missing object, say nothing about load
+            self.release(kind)
+            raise
+        self.release(kind, time.perf_counter() - start)
+
+    def acquire(self):
+        ''' Wait for a free slot under the current limit '''
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, kind, latency=None, error=False):
+        ''' Free a slot, backing off on an error, and otherwise growing the limit by one per
+            window of successes while the latency of the kind of query is flat '''
+        with self.condition:
+            self.in_flight -= 1
+            if error:
+                self.decrease()
+            elif latency is not None:
+                smoothed = self.smoothed_latency.get(kind, latency)
+                smoothed += self.smoothing * (latency - smoothed)
+                self.smoothed_latency[kind] = smoothed
+                baseline = min(self.baseline_latency.get(kind, smoothed), smoothed)
+                self.baseline_latency[kind] = baseline
+
+                if smoothed > baseline * self.latency_tolerance:
+                    self.decrease()
+
+                    # Latency at the new limit becomes the baseline to grow from
+                    self.baseline_latency[kind] = smoothed
+                else:
+                    self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+            self.condition.notify_all()
+
+    def decrease(self):
+        ''' Back off the limit; callers hold the condition '''
+        self.limit = max(self.limit * self.backoff, self.min_limit)
+
+    def status(self):
+        ''' Describe the current limit and queries in flight '''
+        return f'{self.in_flight}/{int(self.limit)} queries'
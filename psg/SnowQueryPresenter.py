@@ -1,33 +1,147 @@
+import threading
+import time
+
 class Presenter:
-    def __init__(self, model, view):
+    def __init__(self, model, view, lazy_load=False):
         ''' Connect presenter to model and view '''
         self.model = model
         self.view = view
         self.view.set_presenter(self)
 
-    def build_tree(self, tree_data, node_level, scope):
-        ''' Retrieve database metadata from Snowflake and build tree below node '''
+        # Load database and schema children only when first expanded
+        self.lazy_load = lazy_load
+
+        # Start time of the query running on the worker thread, if any
+        self.query_start = None
+
+        # Query id of the running query and whether it should be cancelled,
+        # shared with the query thread under query_lock
+        self.query_lock = threading.Lock()
+        self.running_query_id = ''
+        self.cancel_requested = False
+
+        # Whether a benchmark is running on a worker thread
+        self.benchmark_running = False
+
+    def build_tree(self, node_level, scope):
+        ''' Build tree below node, reporting any error in the status bar '''
+        try:
+            self.load_tree(node_level, scope)
+        except Exception as e:
+            # Report the failure instead of leaving a silently half-built tree
+            self.view.send_tree_event('-TREE-STATUS-', f'Error loading tree: {e}')
+            return
+
+        status = 'Ready'
+        resilience_status = self.model.resilience.status()
+        if resilience_status:
+            status += f' - {resilience_status}'
+        self.view.send_tree_event('-TREE-STATUS-', status)
+
+    def load_tree(self, node_level, scope):
+        ''' Retrieve database metadata from Snowflake and send new tree nodes to the view '''
 
-        schema_object_list = self.model.get_schema_object_list(node_level, scope)
+        # Show cached snapshot of the tree while it is revalidated
+        cached_object_list = None
+        if node_level == "Root":
+            cached_object_list = self.model.get_cached_schema_object_list(
+                node_level, scope, self.lazy_load)
+            if cached_object_list:
+                self.view.send_tree_event('-TREE-NODES-', self.get_node_records(cached_object_list))
+                self.view.send_tree_event('-TREE-STATUS-', 'Revalidating...')
 
+        if cached_object_list:
+            schema_object_list = self.model.refresh_schema_object_list(
+                node_level, scope, self.lazy_load)
+
+            # Rebuild tree if the snapshot is out of date
+            if schema_object_list != cached_object_list:
+                self.view.send_tree_event('-TREE-CLEAR-', None)
+                self.view.send_tree_event('-TREE-NODES-', self.get_node_records(schema_object_list))
+        else:
+            # Grow tree as each object type arrives
+            batches = self.model.iter_refreshed_schema_object_list(
+                node_level, scope, self.lazy_load)
+            for object_type, position, total, nodes in batches:
+                self.view.send_tree_event(
+                    '-TREE-STATUS-',
+                    f'Loading {object_type} {position}/{total} ({self.model.limiter.status()})'
+                )
+                self.view.send_tree_event('-TREE-NODES-', self.get_node_records(nodes))
+
+    def get_node_records(self, schema_object_list):
+        ''' Build (parent, key, text, values) tree node records from schema objects '''
+        node_records = []
         for schema_object in schema_object_list:
-            parent = schema_object["parent"]
-            name = schema_object["name"]
-            formatted_name = schema_object["formatted_name"]
-            object_type = schema_object["object_type"]
+            name, parent, formatted_name, object_type, signature = schema_object
             if object_type == "object_header":
                 level = name
             elif object_type in self.model.object_types:
                 level = "leaf"
             else:
                 level = object_type
-            tree_data.Insert(parent, formatted_name, name, [level,])
+            description = signature.arguments() if signature else ""
+            node_records.append((parent, formatted_name, name, [level, description]))
+
+            # Add placeholder child so the node can be expanded
+            if self.lazy_load and level in ("Database", "Schema"):
+                node_records.append((
+                    formatted_name,
+                    f"{formatted_name}.<placeholder>",
+                    "Loading...",
+                    ["placeholder",]))
+        return node_records
+
+    def benchmark_strategies(self):
+        ''' Time each metadata strategy in the background and show the results '''
+        self.start_benchmark('Benchmarking metadata strategies...', self.model.benchmark_strategies)
+
+    def start_benchmark(self, status, benchmark):
+        ''' Run benchmark on a worker thread, keeping the event loop responsive '''
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status_bar('A query or benchmark is already running')
+            return
+        self.benchmark_running = True
+        self.view.set_status_bar(status)
+        threading.Thread(
+            target=self.run_benchmark,
+            args=(benchmark,),
+            daemon=True
+        ).start()
+
+    def run_benchmark(self, benchmark):
+        ''' Run benchmark and send its report to the view; runs on a worker thread '''
+        try:
+            output = benchmark()
+        except Exception as e:
+            output = f'Benchmark failed: {e!r}'
+        self.view.send_query_event('-BENCHMARK-FINISHED-', output)
 
-        self.view.set_tree_data(tree_data)
+    def show_benchmark_output(self, output):
+        ''' Display the benchmark report '''
+        self.benchmark_running = False
+        self.view.set_output_values(
+            {
+                "-OUTPUT-": "",
+                "-QUERYID-": "",
+                "-QUERYDURATION-" : ""
+            },
+            False
+        )
+        self.view.set_output_values({"-OUTPUT-": output}, False)
         self.view.set_status_bar('Ready')
 
+    def benchmark_result_formats(self):
+        ''' Time the last query result in each result format in the background and show the results '''
+        self.start_benchmark('Benchmarking result formats...', self.model.benchmark_result_formats)
+
     def submit_query(self, query):
-        ''' Submit query and return output '''
+        ''' Submit query to run in the background; its output is shown as it is fetched '''
+
+        # Run one query or benchmark at a time
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status_bar('A query or benchmark is already running')
+            return
 
         if query:
             # Clear output values
@@ -40,17 +154,79 @@ class Presenter:
                 False
             )
 
-            # Execute query and return output
-            output, query_details = self.model.run_query(query)
-
-            # Display query output
-            self.view.set_output_values(
-                {
-                    "-OUTPUT-": output,
-                    "-QUERYID-": query_details['query_id'],
-                    "-QUERYDURATION-" : query_details['query_duration']
-                },
-                query_details['query_error']
-            )
+            # Execute query on a worker thread, keeping the event loop responsive
+            self.query_start = time.perf_counter()
+            self.running_query_id = ''
+            self.cancel_requested = False
+            threading.Thread(
+                target=self.run_query,
+                args=(query,),
+                daemon=True
+            ).start()
         else:
             self.show_help(self.run_event)
+
+    def run_query(self, query):
+        ''' Submit query, wait for it, and send its output to the view a batch at a time; runs on a worker thread '''
+        query_id = ''
+        try:
+            query_id = self.model.submit_query(query)
+            self.view.send_query_event('-QUERY-SUBMITTED-', query_id)
+            with self.query_lock:
+                self.running_query_id = query_id
+                cancel = self.cancel_requested
+            if cancel:
+                self.model.cancel_query(query_id)
+            self.model.wait_for_query(query_id)
+            for output, rows_fetched in self.model.iter_query_output(query_id):
+                self.view.send_query_event('-QUERY-ROWS-', (output, rows_fetched))
+            output, query_details = '', self.model.get_query_details(query_id)
+        except Exception as e:
+            output, query_details = self.model.get_error_output(e, query_id)
+        self.view.send_query_event('-QUERY-FINISHED-', (output, query_details))
+
+    def cancel_query(self):
+        ''' Cancel the running query, as soon as it has a query id '''
+        if self.query_start is None:
+            return
+        with self.query_lock:
+            self.cancel_requested = True
+            query_id = self.running_query_id
+        self.view.set_status_bar('Cancelling query...')
+        if query_id:
+            threading.Thread(
+                target=self.send_cancel,
+                args=(query_id,),
+                daemon=True
+            ).start()
+
+    def send_cancel(self, query_id):
+        ''' Ask Snowflake to cancel the query; runs on a worker thread '''
+        try:
+            self.model.cancel_query(query_id)
+        except Exception as e:
+            self.view.send_query_event('-QUERY-STATUS-', f'Cancel failed: {e}')
+        else:
+            self.view.send_query_event('-QUERY-STATUS-', 'Query cancelled')
+
+    def get_query_elapsed(self):
+        ''' Get elapsed time of the running query '''
+        return time.strftime('%H:%M:%S', time.gmtime(time.perf_counter() - self.query_start))
+
+    def show_query_rows(self, output, rows_fetched):
+        ''' Append a batch of query output '''
+        self.view.set_output_values({"-OUTPUT-": output}, False)
+        self.view.set_status_bar(f'{rows_fetched:,} rows fetched')
+
+    def show_query_output(self, output, query_details):
+        ''' Display id and duration of the finished query, or its error '''
+        self.query_start = None
+        self.view.set_output_values(
+            {
+                "-QUERYID-": query_details['query_id'],
+                "-QUERYDURATION-" : query_details['query_duration']
+            },
+            False
+        )
+        if output:
+            self.view.set_output_values({"-OUTPUT-": output}, query_details['query_error'])
@@ -0,0 +1,65 @@
+import sys
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Arrow results need pyarrow, which snowflake-connector-python installs with its pandas extra
+ARROW_AVAILABLE = pa is not None
+
+class ResultStore:
+    ''' Result of a query, held as batches of row tuples converted by the connector '''
+
+    def __init__(self, field_names, numeric_fields):
+        ''' Hold rows of the given columns; numeric columns are right aligned when rendered '''
+        self.field_names = field_names
+        self.numeric_fields = numeric_fields
+        self.batches = []
+        self.num_rows = 0
+
+    def fetch(self, cursor, batch_size):
+        ''' Fetch the cursor's result batch_size rows at a time, yielding each batch once stored '''
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield self.append(rows)
+
+    def append(self, batch):
+        ''' Store a batch and return it '''
+        self.batches.append(batch)
+        self.num_rows += len(batch)
+        return batch
+
+    def batch_rows(self, batch):
+        ''' Get the rows of a stored batch as tuples '''
+        return batch
+
+    def nbytes(self):
+        ''' Estimate memory held by the stored rows '''
+        return sum(
+            sys.getsizeof(batch) + sum(
+                sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+                for row in batch
+            )
+            for batch in self.batches
+        )
+
+class ArrowResultStore(ResultStore):
+    ''' Result of a query, held as the Arrow record batches downloaded by the connector '''
+
+    def fetch(self, tables, batch_size):
+        ''' Split Arrow tables from fetch_arrow_batches into batches of up to batch_size rows, yielding each once stored '''
+        for table in tables:
+            for batch in table.to_batches(max_chunksize=batch_size):
+                if batch.num_rows:
+                    yield self.append(batch)
+
+    def batch_rows(self, batch):
+        ''' Get the rows of a stored batch as tuples, converting a column at a time '''
+        return list(zip(*(column.to_pylist() for column in batch.columns)))
+
+    def nbytes(self):
+        ''' Get memory held by the stored Arrow buffers '''
+        return sum(batch.nbytes for batch in self.batches)
@@ -27,6 +27,7 @@ class View:
 
         # Event labels
         self.run_event     = '▶'      #F5
+        self.cancel_event  = '■'      #Esc
         self.new_event     = 'New      Ctrl+N'
         self.open_event    = 'Open     Ctrl+O'
         self.save_event    = 'Save     Ctrl+S'
@@ -35,10 +36,22 @@ class View:
         self.help_event    = 'Help     F1'
         self.about_event   = 'About'
         self.refresh_event = '⟳'
+        self.benchmark_event = 'Benchmark Metadata Strategies'
+        self.benchmark_results_event = 'Benchmark Result Formats'
+
+        # Elapsed time of a running query is refreshed every
+        # query_poll_interval milliseconds while waiting for events
+        self.query_poll_interval = 100
 
         # Query file name and label
         self.query_file = None
         self.new_query = 'New Query'
+
+        # Object type folders show folder_page_size objects at a time; the
+        # rest are held behind a "Load more..." node until it is selected
+        self.folder_page_size = 1000
+        self.folder_limits = {}
+        self.held_tree_nodes = {}
         
         # Create the Window layout
         self.menu_def = [
@@ -49,6 +62,9 @@ class View:
                 self.save_as_event.replace('A','&A'),
                 '---',
                 '&' + self.quit_event]],
+            ['&Tools',
+                ['&' + self.benchmark_event,
+                self.benchmark_results_event.replace('R','&R')]],
             ['&Help',
                 ['&' + self.help_event,
                 '&' + self.about_event]]]
@@ -97,7 +113,8 @@ class View:
                     border_width=0,
                     metadata=sg.theme(),
                     tooltip='Toggle between light and dark themes'),
-                sg.Button(self.run_event,tooltip='Run (F5)')],
+                sg.Button(self.run_event,tooltip='Run (F5)'),
+                sg.Button(self.cancel_event,tooltip='Cancel (Esc)')],
             [sg.Multiline(
                     size=(80,15),
                     key='-QUERY-',
@@ -151,10 +168,12 @@ class View:
             finalize=True)
         tree = self.window['-TREE-']
         tree.Widget.configure(show='tree')
+        tree.bind('<<TreeviewOpen>>', '+EXPAND')
         self.window['-QUERY-'].set_focus()
 
         # Bind keys to events
         self.window.bind('<F5>', self.run_event)
+        self.window.bind('<Escape>', self.cancel_event)
         self.window.bind('<Control-n>', self.new_event)
         self.window.bind('<Control-o>', self.open_event)
         self.window.bind('<Control-s>', self.save_event)
@@ -167,7 +186,82 @@ class View:
         self.presenter = presenter
 
     def set_tree_data(self, tree_data):
-        self.window['-TREE-'].update(values=tree_data)
+        tree = self.window['-TREE-']
+
+        # Keep expanded nodes open across the redraw
+        open_keys = [
+            key for id, key in tree.IdToKey.items()
+            if id and tree.Widget.item(id, 'open')
+        ]
+        tree.update(values=tree_data)
+        self.folder_limits.clear()
+        self.held_tree_nodes.clear()
+        for key in open_keys:
+            if key in tree.KeyToID:
+                tree.Widget.item(tree.KeyToID[key], open=True)
+
+    def send_tree_event(self, event, value):
+        ''' Send tree update from the tree building thread to the event loop '''
+        self.window.write_event_value(event, value)
+
+    def send_query_event(self, event, value):
+        ''' Send query progress from the query thread to the event loop '''
+        self.window.write_event_value(event, value)
+
+    def add_tree_nodes(self, node_records):
+        ''' Insert nodes, holding objects past the folder limit behind a "Load more..." node '''
+        tree_data = self.get_tree_data()
+        for node_record in node_records:
+            parent, key, text, values = node_record
+            if values[0] == 'leaf':
+                limit = self.folder_limits.get(parent, self.folder_page_size)
+                if len(tree_data.tree_dict[parent].children) >= limit:
+                    held_nodes = self.held_tree_nodes.setdefault(parent, [])
+                    if not held_nodes:
+                        self.insert_tree_node(parent, f'{parent}.<more>', 'Load more...', ['more',])
+                    held_nodes.append(node_record)
+                    continue
+            self.insert_tree_node(parent, key, text, values)
+
+    def insert_tree_node(self, parent, key, text, values):
+        ''' Insert node into the tree data and render only the new node '''
+        tree = self.window['-TREE-']
+        tree.TreeData.Insert(parent, key, text, values)
+        id = tree.Widget.insert(
+            tree.KeyToID[parent],
+            'end',
+            text=text,
+            values=values,
+            open=tree.ShowExpanded)
+        tree.IdToKey[id] = key
+        tree.KeyToID[key] = id
+
+    def select_tree_node(self, selection):
+        ''' Load more objects when a "Load more..." node is selected, or describe the selected object '''
+        node = self.get_tree_data().tree_dict.get(selection[0]) if selection else None
+        if node and node.values[0] == 'more':
+            self.load_more_tree_nodes(node)
+        elif node and len(node.values) > 1 and node.values[1]:
+            self.set_status_bar(node.values[1])
+
+    def load_more_tree_nodes(self, node):
+        ''' Replace a "Load more..." node with the next page of held objects '''
+        tree = self.window['-TREE-']
+        tree_data = tree.TreeData
+        parent_node = tree_data.tree_dict[node.parent]
+        tree.Widget.delete(tree.KeyToID[node.key])
+        del tree.IdToKey[tree.KeyToID.pop(node.key)]
+        del tree_data.tree_dict[node.key]
+        parent_node.children.remove(node)
+
+        self.folder_limits[node.parent] = len(parent_node.children) + self.folder_page_size
+        self.add_tree_nodes(self.held_tree_nodes.pop(node.parent, []))
+        remaining = len(self.held_tree_nodes.get(node.parent, []))
+        if remaining:
+            more_key = f'{node.parent}.<more>'
+            more_text = f'Load more... ({remaining:,} more)'
+            tree_data.tree_dict[more_key].text = more_text
+            tree.Widget.item(tree.KeyToID[more_key], text=more_text)
 
     def get_tree_data(self):
         return self.window['-TREE-'].TreeData
@@ -195,13 +289,37 @@ class View:
 
         # Event Loop to process "events"
         while True:             
-            event, values = self.window.read()
+            # Wake up periodically while a query is running
+            timeout = self.query_poll_interval if self.presenter.query_start is not None else None
+            event, values = self.window.read(timeout=timeout)
             if event in (sg.WIN_CLOSED, self.quit_event):
                 break
             elif event == '-TOGGLE-THEME-':
                 self.toggle_theme()
             elif event == '-TREE-':
-                continue
+                self.select_tree_node(values['-TREE-'])
+            elif event == '-TREE-+EXPAND':
+                self.expand_tree_node()
+            elif event == '-TREE-NODES-':
+                self.add_tree_nodes(values[event])
+            elif event == '-TREE-CLEAR-':
+                self.set_tree_data(sg.TreeData())
+            elif event == '-TREE-STATUS-':
+                self.set_status_bar(values[event])
+            elif event == sg.TIMEOUT_KEY:
+                self.window['-QUERYDURATION-'].update(self.presenter.get_query_elapsed())
+            elif event == '-QUERY-SUBMITTED-':
+                self.window['-QUERYID-'].update(values[event])
+            elif event == '-BENCHMARK-FINISHED-':
+                self.presenter.show_benchmark_output(values[event])
+            elif event == '-QUERY-ROWS-':
+                self.presenter.show_query_rows(*values[event])
+            elif event == '-QUERY-STATUS-':
+                self.set_status_bar(values[event])
+            elif event == self.cancel_event:
+                self.presenter.cancel_query()
+            elif event == '-QUERY-FINISHED-':
+                self.presenter.show_query_output(*values[event])
             elif event == self.new_event:
                 query_file = self.new_file()
             elif event == self.open_event:
@@ -214,6 +332,10 @@ class View:
                 self.show_help()
             elif event == self.about_event:
                 self.show_about()
+            elif event == self.benchmark_event:
+                self.presenter.benchmark_strategies()
+            elif event == self.benchmark_results_event:
+                self.presenter.benchmark_result_formats()
             elif event == self.refresh_event:
                 self.refresh_tree('')
             elif event == self.run_event:
@@ -257,6 +379,15 @@ class View:
         elif event == 'Refresh::Refresh~-TREE-':
             self.refresh_tree(value)
 
+    def expand_tree_node(self):
+        ''' Load children of a lazily loaded node on first expand '''
+        tree = self.window['-TREE-']
+        node_key = tree.IdToKey.get(tree.Widget.focus())
+        node = self.get_tree_data().tree_dict.get(node_key)
+        if (node and len(node.children) == 1
+        and node.children[0].values[0] == 'placeholder'):
+            self.refresh_tree(node_key)
+
     def refresh_tree(self, node_key):
         ''' Prune and rebuild tree under selected node '''
         tree_data = self.get_tree_data()
@@ -274,14 +405,14 @@ class View:
             scope = "ACCOUNT"
         elif node_level in ("Database", "Schema"):
             scope = f"{node_level} {node.key}"
-        elif node_level != "leaf":
+        elif node_level not in ("leaf", "placeholder", "more"):
             scope = f"Schema {node.parent}"
 
         # Continue if valid scope identified
         if scope:
             if node_key:
                 status = 'Refreshing...'
-                self.prune(tree_data, node)
+                self.prune(node)
             else:
                 status = 'Loading databases...'
                 tree_data = sg.TreeData()
@@ -292,23 +423,30 @@ class View:
             # Start thread to build database tree
             threading.Thread(
                 target=self.presenter.build_tree,
-                args=(tree_data, node_level, scope),
+                args=(node_level, scope),
                 daemon=True
             ).start()
 
-    def prune(self, tree_data, node):
+    def prune(self, node):
         ''' Delete all descendant nodes under selected node '''
-        descendant_nodes = self.get_descendant_nodes(node, [])
-        for parent_node, node in descendant_nodes:
-            parent_node.children.remove(node)
-            del tree_data.tree_dict[node.key]
-
-    def get_descendant_nodes(self, node, descendant_nodes):
-        ''' Collect and return all descendant nodes of selected node '''
-        for child in node.children:
-            descendant_nodes.append([node, child])
-            descendant_nodes = self.get_descendant_nodes(child, descendant_nodes)
-        return descendant_nodes
+        tree = self.window['-TREE-']
+        tree_data = tree.TreeData
+
+        # Deleting the child rows removes their whole subtrees from the Treeview
+        tree.Widget.delete(*[tree.KeyToID[child.key] for child in node.children])
+
+        # Walk the subtree iteratively to drop its keys and held objects
+        self.folder_limits.pop(node.key, None)
+        self.held_tree_nodes.pop(node.key, None)
+        descendant_nodes = list(node.children)
+        while descendant_nodes:
+            descendant_node = descendant_nodes.pop()
+            descendant_nodes.extend(descendant_node.children)
+            del tree_data.tree_dict[descendant_node.key]
+            del tree.IdToKey[tree.KeyToID.pop(descendant_node.key)]
+            self.folder_limits.pop(descendant_node.key, None)
+            self.held_tree_nodes.pop(descendant_node.key, None)
+        node.children = []
 
     def do_clipboard_operation(self, event):
         ''' Execute multiline context event '''
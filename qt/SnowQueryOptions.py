@@ -0,0 +1,28 @@
+import argparse
+
+def parse_options(args=None):
+    ''' Parse command line options '''
+    parser = argparse.ArgumentParser(description='Simple Snowflake query application')
+    parser.add_argument(
+        '--metadata-mode',
+        choices=['serial', 'parallel', 'batched'],
+        default='parallel',
+        help='run SHOW calls one at a time, concurrently, or in a single anonymous block (default: parallel)'
+    )
+    parser.add_argument(
+        '--metadata-source',
+        choices=['show', 'account_usage', 'information_schema'],
+        default='show',
+        help='read metadata with SHOW commands, or from the ACCOUNT_USAGE or INFORMATION_SCHEMA views (default: show)'
+    )
+    parser.add_argument(
+        '--fan-out-databases',
+        action='store_true',
+        help='load the account with concurrent SHOW calls per database instead of account-wide SHOW calls'
+    )
+    parser.add_argument(
+        '--lazy-load',
+        action='store_true',
+        help='list only databases at startup, loading schemas and objects when a node is first expanded'
+    )
+    return parser.parse_args(args)
@@ -1,54 +1,179 @@
-from PySide6.QtWidgets import QTreeWidgetItem
+import threading
+import time
 
 class Presenter:
 
-    # Constants for node column positions
+    # Constants for node record positions
     NAME = 0
     PARENT = 1
     FORMATTED_NAME = 2
     OBJECT_TYPE = 3
     NODE_LEVEL = 3
+    DESCRIPTION = 4
 
-    def __init__(self, model, view):
+    def __init__(self, model, view, lazy_load=False):
         ''' Connect presenter to model and view '''
         self.model = model
         self.view = view
         self.view.set_presenter(self)
-        self.node_dict = {}
+
+        # Load database and schema children only when first expanded
+        self.lazy_load = lazy_load
+
+        # Start time of the query running on the worker thread, if any
+        self.query_start = None
+
+        # Query id of the running query and whether it should be cancelled,
+        # shared with the query thread under query_lock
+        self.query_lock = threading.Lock()
+        self.running_query_id = ""
+        self.cancel_requested = False
+
+        # Whether a benchmark is running on a worker thread
+        self.benchmark_running = False
+
+        # Whether the running query's result is shown in the result grid,
+        # which formats only visible cells, rather than as Markdown text
+        self.result_grid = False
 
     def build_tree(self, node_level, scope):
+        ''' Build tree below node, reporting any error in the status bar '''
+        try:
+            self.load_tree(node_level, scope)
+        except Exception as e:
+            # Report the failure instead of leaving a silently half-built tree
+            self.view.update_status.emit(f"Error loading tree: {e}")
+            return
+
+        # Send signal to UI to update status
+        status = "Ready"
+        resilience_status = self.model.resilience.status()
+        if resilience_status:
+            status += f" - {resilience_status}"
+        self.view.update_status.emit(status)
+
+    def load_tree(self, node_level, scope):
         ''' Retrieve database metadata from Snowflake and build tree below node '''
 
-        schema_object_list = self.model.get_schema_object_list(node_level, scope)
+        # Show cached snapshot of the tree while it is revalidated
+        cached_object_list = None
+        if node_level == "Root":
+            cached_object_list = self.model.get_cached_schema_object_list(
+                node_level, scope, self.lazy_load)
+            if cached_object_list:
+                self.view.update_tree.emit(self.get_node_records(cached_object_list))
+                self.view.update_status.emit("Revalidating...")
+
+        if cached_object_list:
+            schema_object_list = self.model.refresh_schema_object_list(
+                node_level, scope, self.lazy_load)
 
-        # Create tree nodes and add to tree
+            # Rebuild tree if the snapshot is out of date
+            if schema_object_list != cached_object_list:
+                self.view.reset_tree.emit()
+                self.view.update_tree.emit(self.get_node_records(schema_object_list))
+        else:
+            # Grow tree as each object type arrives
+            batches = self.model.iter_refreshed_schema_object_list(
+                node_level, scope, self.lazy_load)
+            for object_type, position, total, nodes in batches:
+                self.view.update_status.emit(
+                    f"Loading {object_type} {position}/{total} ({self.model.limiter.status()})"
+                )
+                self.view.update_tree.emit(self.get_node_records(nodes))
+
+    def get_node_records(self, schema_object_list):
+        ''' Build plain node records for the GUI thread '''
+        node_records = []
         for schema_object in schema_object_list:
-            name, parent, formatted_name, object_type = schema_object.values()
+            name, parent, formatted_name, object_type, signature = schema_object
             if object_type == "object_header":
                 node_level = name
             elif object_type in self.model.object_types:
                 node_level = "leaf"
             else:
                 node_level = object_type
-            node = QTreeWidgetItem([
+            node_records.append([
                 name,
                 parent,
                 formatted_name,
-                node_level
+                node_level,
+                signature.arguments() if signature else ""
             ])
-            
-            # Save nodes for parent node lookup
-            self.node_dict[formatted_name] = node
-            if parent:
-                self.node_dict[parent].addChild(node)
-            else:
-                self.view.tree.addTopLevelItem(node)
 
-        # Send signal to UI to update status
-        self.view.update_status.emit("Ready")
+            # Add placeholder child so the node can be expanded
+            if self.lazy_load and node_level in ("Database", "Schema"):
+                node_records.append([
+                    "Loading...",
+                    formatted_name,
+                    "",
+                    "placeholder",
+                    ""
+                ])
+        return node_records
+
+    def add_nodes(self, node_records):
+        ''' Add nodes to the tree model; must run on the GUI thread '''
+        self.view.tree_model.add_nodes(node_records)
+
+    def clear_nodes(self):
+        ''' Remove all nodes from the tree model; must run on the GUI thread '''
+        self.view.tree_model.clear()
+
+    def benchmark_strategies(self):
+        ''' Time each metadata strategy in the background and show the results '''
+        self.start_benchmark('Benchmarking metadata strategies...', self.model.benchmark_strategies)
+
+    def start_benchmark(self, status, benchmark):
+        ''' Run benchmark on a worker thread, keeping the event loop responsive '''
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status("A query or benchmark is already running")
+            return
+        self.benchmark_running = True
+        self.view.set_status(status)
+        threading.Thread(
+            target=self.run_benchmark,
+            args=(benchmark,),
+            daemon=True
+        ).start()
+
+    def run_benchmark(self, benchmark):
+        ''' Run benchmark and send its report to the view; runs on a worker thread '''
+        try:
+            output = benchmark()
+        except Exception as e:
+            output = f"Benchmark failed: {e!r}"
+        self.view.benchmark_finished.emit(output)
+
+    def show_benchmark_output(self, output):
+        ''' Display the benchmark report; must run on the GUI thread '''
+        self.benchmark_running = False
+        self.view.set_output_values(
+            {
+                "OUTPUT": output,
+                "QUERYID": "",
+                "QUERYDURATION" : ""
+            },
+            False
+        )
+        self.view.set_status('Ready')
+
+    def benchmark_result_formats(self):
+        ''' Time the last query result in each result format in the background and show the results '''
+        self.start_benchmark('Benchmarking result formats...', self.model.benchmark_result_formats)
+
+    def toggle_result_grid(self, checked):
+        ''' Note the result display chosen for the next query; shown results keep their display '''
+        display = 'a grid' if checked else 'text'
+        self.view.set_status(f'Results of the next query will be shown as {display}')
 
     def submit_query(self):
-        ''' Submit query and return output '''
+        ''' Submit query to run in the background; its output is shown as it is fetched '''
+
+        # Run one query or benchmark at a time
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status("A query or benchmark is already running")
+            return
 
         query = self.view.query_box.toPlainText()
         if query:
@@ -61,18 +186,89 @@ class Presenter:
                 },
                 False
             )
+            # Result display is fixed when the query starts; toggling it applies to the next query
+            self.result_grid = self.view.actionResultGrid.isChecked()
+            self.view.result_model.set_result_store(None)
+            self.view.show_result_grid(self.result_grid)
 
-            # Execute query and return output
-            output, query_details = self.model.run_query(query)
-
-            # Display query output
-            self.view.set_output_values(
-                {
-                    "OUTPUT": output,
-                    "QUERYID": query_details['query_id'],
-                    "QUERYDURATION" : query_details['query_duration']
-                },
-                query_details['query_error']
-            )
+            # Execute query on a worker thread, keeping the event loop responsive
+            self.query_start = time.perf_counter()
+            self.running_query_id = ""
+            self.cancel_requested = False
+            self.view.query_timer.start()
+            threading.Thread(
+                target=self.run_query,
+                args=(query, not self.result_grid),
+                daemon=True
+            ).start()
         else:
             self.view.show_help()
+
+    def run_query(self, query, render):
+        ''' Submit query, wait for it, and send its output to the view a batch at a time, formatted if render
+            is set; runs on a worker thread '''
+        query_id = ""
+        try:
+            query_id = self.model.submit_query(query)
+            self.view.query_submitted.emit(query_id)
+            with self.query_lock:
+                self.running_query_id = query_id
+                cancel = self.cancel_requested
+            if cancel:
+                self.model.cancel_query(query_id)
+            self.model.wait_for_query(query_id)
+            for output, rows_fetched in self.model.iter_query_output(query_id, render):
+                self.view.query_rows.emit(output, rows_fetched)
+            output, query_details = "", self.model.get_query_details(query_id)
+        except Exception as e:
+            output, query_details = self.model.get_error_output(e, query_id)
+        self.view.query_finished.emit((output, query_details))
+
+    def cancel_query(self):
+        ''' Cancel the running query, as soon as it has a query id '''
+        if self.query_start is None:
+            return
+        with self.query_lock:
+            self.cancel_requested = True
+            query_id = self.running_query_id
+        self.view.set_status("Cancelling query...")
+        if query_id:
+            threading.Thread(
+                target=self.send_cancel,
+                args=(query_id,),
+                daemon=True
+            ).start()
+
+    def send_cancel(self, query_id):
+        ''' Ask Snowflake to cancel the query; runs on a worker thread '''
+        try:
+            self.model.cancel_query(query_id)
+        except Exception as e:
+            self.view.update_status.emit(f"Cancel failed: {e}")
+        else:
+            self.view.update_status.emit("Query cancelled")
+
+    def get_query_elapsed(self):
+        ''' Get elapsed time of the running query '''
+        if self.query_start is None:
+            return ""
+        return time.strftime('%H:%M:%S', time.gmtime(time.perf_counter() - self.query_start))
+
+    def show_query_rows(self, output, rows_fetched):
+        ''' Append a batch of query output, or show it in the result grid; must run on the GUI thread '''
+        if self.result_grid:
+            # Store of the running query is set before its first batch is sent
+            if self.view.result_model.result_store is not self.model.result_store:
+                self.view.result_model.set_result_store(self.model.result_store)
+            self.view.result_model.expose_rows(rows_fetched)
+        else:
+            self.view.append_output(output, False)
+        self.view.set_status(f"{rows_fetched:,} rows fetched")
+
+    def show_query_output(self, output, query_details):
+        ''' Display id and duration of the finished query, or its error; must run on the GUI thread '''
+        self.query_start = None
+        self.view.query_id.setText(query_details['query_id'])
+        self.view.query_duration.setText(query_details['query_duration'])
+        if output:
+            self.view.append_output(output, query_details['query_error'])
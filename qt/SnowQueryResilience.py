@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    ''' Raised instead of calling Snowflake while the circuit is open '''
+
+class Resilience:
+    ''' Jittered exponential retry of idempotent calls, behind a circuit breaker on the connection '''
+
+    def __init__(self, retryable_errors, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        ''' Retry calls failing with retryable_errors up to max_attempts times '''
+        self.retryable_errors = retryable_errors
+        self.max_attempts = max_attempts
+
+        # Each retry sleeps a random time up to base_delay doubled per
+        # attempt, capped at max_delay, so parallel callers spread out
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # Circuit opens after failure_threshold consecutive failures and lets
+        # a single trial call through once reset_timeout seconds have passed
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+        # Counters
+        self.retries = 0
+        self.failures = 0
+        self.short_circuits = 0
+
+        self.lock = threading.Lock()
+
+    def call(self, function, *args, retry=True):
+        ''' Call function, retrying retryable errors if retry is set, unless the circuit is open '''
+        attempt = 0
+        while True:
+            self.check_circuit()
+            try:
+                result = function(*args)
+            except self.retryable_errors:
+                self.record_failure()
+                attempt += 1
+                if not retry or attempt >= self.max_attempts:
+                    raise
+            except Exception:
+                # Snowflake answered, so the connection itself is working
+                self.record_success()
+                raise
+            else:
+                self.record_success()
+                return result
+
+            with self.lock:
+                self.retries += 1
+            time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))))
+
+    def check_circuit(self):
+        ''' Raise CircuitOpenError while the circuit is open, letting one trial call through after the timeout '''
+        with self.lock:
+            if self.opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining <= 0 and not self.trial_running:
+                self.trial_running = True
+                return
+            self.short_circuits += 1
+        raise CircuitOpenError(
+            f'Snowflake connection is failing; calls are paused for {max(remaining, 0):.0f}s')
+
+    def record_success(self):
+        ''' Close the circuit '''
+        with self.lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        ''' Count a failure, opening the circuit at the threshold or when a trial call fails '''
+        with self.lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.trial_running or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+    def status(self):
+        ''' Describe retries and failures so far, or an empty string if there were none '''
+        counts = [
+            f'{count} {label}'
+            for count, label in (
+                (self.retries, 'retries'),
+                (self.failures, 'failures'),
+                (self.short_circuits, 'short circuits')
+            )
+            if count
+        ]
+        return ', '.join(counts)
@@ -0,0 +1,62 @@
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    Qt
+)
+
+class ResultModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        ''' Initialize empty result grid '''
+        super().__init__(parent)
+        self.result_store = None
+
+        # Rows of the store exposed to the view; the store may already hold
+        # more, appended by the query thread
+        self.row_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        ''' Get number of rows exposed to the view '''
+        if parent.isValid():
+            return 0
+        return self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        ''' Get number of result columns '''
+        if parent.isValid() or self.result_store is None:
+            return 0
+        return len(self.result_store.field_names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        ''' Format a cell for the view; only called for visible cells '''
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.result_store.value(index.row(), index.column()))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            # Right align numeric columns
+            if self.result_store.field_names[index.column()] in self.result_store.numeric_fields:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        ''' Get column name or row number '''
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.result_store.field_names[section]
+        return section + 1
+
+    def set_result_store(self, result_store):
+        ''' Show the columns of a new result store, or nothing if None '''
+        self.beginResetModel()
+        self.result_store = result_store
+        self.row_count = 0
+        self.endResetModel()
+
+    def expose_rows(self, count):
+        ''' Expose the first count rows of the result store to the view '''
+        if count > self.row_count:
+            self.beginInsertRows(QModelIndex(), self.row_count, count - 1)
+            self.row_count = count
+            self.endInsertRows()
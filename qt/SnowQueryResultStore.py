@@ -0,0 +1,87 @@
+from bisect import bisect_right
+import sys
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Arrow results need pyarrow, which snowflake-connector-python installs with its pandas extra
+ARROW_AVAILABLE = pa is not None
+
+class ResultStore:
+    ''' Result of a query, held as batches of row tuples converted by the connector '''
+
+    def __init__(self, field_names, numeric_fields):
+        ''' Hold rows of the given columns; numeric columns are right aligned when rendered '''
+        self.field_names = field_names
+        self.numeric_fields = numeric_fields
+        self.batches = []
+        self.num_rows = 0
+
+        # First row number of each batch, for looking up single cells
+        self.batch_offsets = []
+
+    def fetch(self, cursor, batch_size):
+        ''' Fetch the cursor's result batch_size rows at a time, yielding each batch once stored '''
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield self.append(rows)
+
+    def append(self, batch):
+        ''' Store a batch and return it '''
+        # Batches are added before their offsets, so readers on other threads
+        # never find an offset without its batch
+        self.batches.append(batch)
+        self.batch_offsets.append(self.num_rows)
+        self.num_rows += len(batch)
+        return batch
+
+    def locate(self, row):
+        ''' Get the stored batch holding row, and the row's position within it '''
+        position = bisect_right(self.batch_offsets, row) - 1
+        return self.batches[position], row - self.batch_offsets[position]
+
+    def value(self, row, column):
+        ''' Get the value of a single cell '''
+        batch, batch_row = self.locate(row)
+        return batch[batch_row][column]
+
+    def batch_rows(self, batch):
+        ''' Get the rows of a stored batch as tuples '''
+        return batch
+
+    def nbytes(self):
+        ''' Estimate memory held by the stored rows '''
+        return sum(
+            sys.getsizeof(batch) + sum(
+                sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+                for row in batch
+            )
+            for batch in self.batches
+        )
+
+class ArrowResultStore(ResultStore):
+    ''' Result of a query, held as the Arrow record batches downloaded by the connector '''
+
+    def fetch(self, tables, batch_size):
+        ''' Split Arrow tables from fetch_arrow_batches into batches of up to batch_size rows, yielding each once stored '''
+        for table in tables:
+            for batch in table.to_batches(max_chunksize=batch_size):
+                if batch.num_rows:
+                    yield self.append(batch)
+
+    def batch_rows(self, batch):
+        ''' Get the rows of a stored batch as tuples, converting a column at a time '''
+        return list(zip(*(column.to_pylist() for column in batch.columns)))
+
+    def value(self, row, column):
+        ''' Get the value of a single cell, converting only that value '''
+        batch, batch_row = self.locate(row)
+        return batch.column(column)[batch_row].as_py()
+
+    def nbytes(self):
+        ''' Get memory held by the stored Arrow buffers '''
+        return sum(batch.nbytes for batch in self.batches)
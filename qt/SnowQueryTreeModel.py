@@ -0,0 +1,158 @@
+from PySide6.QtCore import (
+    QAbstractItemModel,
+    QModelIndex,
+    Qt
+)
+
+class TreeNode:
+    ''' Compact node held in the Python-side node store '''
+    __slots__ = (
+        'name',
+        'parent',
+        'formatted_name',
+        'node_level',
+        'description',
+        'children',
+        'row',
+        'fetched'
+    )
+
+    def __init__(self, name, parent, formatted_name, node_level, description=""):
+        ''' Initialize node '''
+        self.name = name
+        self.parent = parent
+        self.formatted_name = formatted_name
+        self.node_level = node_level
+
+        # Signature of a function or procedure, shown as its tooltip
+        self.description = description
+        self.children = []
+        self.row = 0
+
+        # Number of children exposed to the view
+        self.fetched = 0
+
+    def parent_name(self):
+        ''' Get formatted name of parent node '''
+        return self.parent.formatted_name if self.parent else ""
+
+class TreeModel(QAbstractItemModel):
+    def __init__(self, parent=None):
+        ''' Initialize empty tree '''
+        super().__init__(parent)
+        self.root = TreeNode("", None, "", "Root")
+
+        # Nodes by formatted name for parent node lookup
+        self.node_dict = {"": self.root}
+
+        # Children are exposed to the view in chunks of fetch_size rows
+        self.fetch_size = 1000
+
+    def node(self, index):
+        ''' Get node for model index '''
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def node_index(self, node):
+        ''' Get model index for node '''
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        ''' Get model index of the row under parent '''
+        parent_node = self.node(parent)
+        if column != 0 or row < 0 or row >= parent_node.fetched:
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index):
+        ''' Get model index of the parent of index '''
+        if not index.isValid():
+            return QModelIndex()
+        return self.node_index(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        ''' Get number of rows exposed under parent '''
+        if parent.column() > 0:
+            return 0
+        return self.node(parent).fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        ''' Get number of columns '''
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        ''' Check whether parent has children in the node store '''
+        return bool(self.node(parent).children)
+
+    def canFetchMore(self, parent):
+        ''' Check whether parent has children not yet exposed to the view '''
+        node = self.node(parent)
+        return node.fetched < len(node.children)
+
+    def fetchMore(self, parent):
+        ''' Expose the next chunk of children to the view '''
+        node = self.node(parent)
+        self.expose_children(node, node.fetched + self.fetch_size)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        ''' Get node data for the view; only called for visible rows '''
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return index.internalPointer().name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return index.internalPointer().description or None
+        return None
+
+    def expose_children(self, node, count):
+        ''' Expose up to count children of node to the view '''
+        count = min(count, len(node.children))
+        if count > node.fetched:
+            self.beginInsertRows(self.node_index(node), node.fetched, count - 1)
+            node.fetched = count
+            self.endInsertRows()
+
+    def add_nodes(self, node_records):
+        ''' Add (name, parent, formatted name, node level, description) records to the node store '''
+        touched_nodes = {}
+        for name, parent, formatted_name, node_level, description in node_records:
+            parent_node = self.node_dict[parent]
+            node = TreeNode(name, parent_node, formatted_name, node_level, description)
+            node.row = len(parent_node.children)
+            parent_node.children.append(node)
+            touched_nodes[id(parent_node)] = parent_node
+            if formatted_name:
+                self.node_dict[formatted_name] = node
+
+        # Expose the first chunk of new children; the rest are fetched on demand
+        for parent_node in touched_nodes.values():
+            self.expose_children(parent_node, max(parent_node.fetched, self.fetch_size))
+
+    def remove_children(self, node):
+        ''' Remove all descendants of node from the view and the node store '''
+        exposed = node.fetched
+        if exposed:
+            self.beginRemoveRows(self.node_index(node), 0, exposed - 1)
+        descendant_nodes = node.children
+        node.children = []
+        node.fetched = 0
+        if exposed:
+            self.endRemoveRows()
+
+        # Walk the subtree iteratively to drop it from the lookup
+        while descendant_nodes:
+            descendant_node = descendant_nodes.pop()
+            descendant_nodes.extend(descendant_node.children)
+            if self.node_dict.get(descendant_node.formatted_name) is descendant_node:
+                del self.node_dict[descendant_node.formatted_name]
+
+    def clear(self):
+        ''' Remove all nodes '''
+        self.beginResetModel()
+        self.root.children = []
+        self.root.fetched = 0
+        self.node_dict = {"": self.root}
+        self.endResetModel()
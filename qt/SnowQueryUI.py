@@ -19,8 +19,8 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
 from PySide6.QtWidgets import (QApplication, QFrame, QHBoxLayout, QHeaderView,
     QLabel, QLayout, QLineEdit, QMainWindow,
     QMenu, QMenuBar, QPushButton, QSizePolicy,
-    QSpacerItem, QSplitter, QTextEdit, QTreeWidget,
-    QTreeWidgetItem, QVBoxLayout, QWidget)
+    QSpacerItem, QSplitter, QTableView, QTextEdit,
+    QTreeView, QVBoxLayout, QWidget)
 
 from AnimatedToggle import AnimatedToggle
 import resources_rc
@@ -61,6 +61,13 @@ class Ui_MainWindow(object):
         self.actionAbout.setObjectName(u"actionAbout")
         icon7 = QIcon(QIcon.fromTheme(u"help-about"))
         self.actionAbout.setIcon(icon7)
+        self.actionBenchmark = QAction(MainWindow)
+        self.actionBenchmark.setObjectName(u"actionBenchmark")
+        self.actionBenchmarkResults = QAction(MainWindow)
+        self.actionBenchmarkResults.setObjectName(u"actionBenchmarkResults")
+        self.actionResultGrid = QAction(MainWindow)
+        self.actionResultGrid.setObjectName(u"actionResultGrid")
+        self.actionResultGrid.setCheckable(True)
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         sizePolicy = QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
@@ -106,10 +113,7 @@ class Ui_MainWindow(object):
 
         self.verticalLayout.addLayout(self.horizontalLayout_2)
 
-        self.tree = QTreeWidget(self.layoutWidget)
-        __qtreewidgetitem = QTreeWidgetItem()
-        __qtreewidgetitem.setText(0, u"1");
-        self.tree.setHeaderItem(__qtreewidgetitem)
+        self.tree = QTreeView(self.layoutWidget)
         self.tree.setObjectName(u"tree")
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -156,6 +160,12 @@ class Ui_MainWindow(object):
 
         self.horizontalLayout_3.addWidget(self.run_button)
 
+        self.cancel_button = QPushButton(self.layoutWidget1)
+        self.cancel_button.setObjectName(u"cancel_button")
+        self.cancel_button.setMaximumSize(QSize(25, 16777215))
+
+        self.horizontalLayout_3.addWidget(self.cancel_button)
+
 
         self.verticalLayout_3.addLayout(self.horizontalLayout_3)
 
@@ -185,6 +195,12 @@ class Ui_MainWindow(object):
 
         self.verticalLayout_2.addWidget(self.output_box)
 
+        self.result_grid = QTableView(self.layoutWidget2)
+        self.result_grid.setObjectName(u"result_grid")
+        self.result_grid.setFont(font)
+
+        self.verticalLayout_2.addWidget(self.result_grid)
+
         self.splitter.addWidget(self.layoutWidget2)
         self.splitter_2.addWidget(self.splitter)
 
@@ -234,11 +250,14 @@ class Ui_MainWindow(object):
         self.menubar.setGeometry(QRect(0, 0, 800, 20))
         self.menuFile = QMenu(self.menubar)
         self.menuFile.setObjectName(u"menuFile")
+        self.menuTools = QMenu(self.menubar)
+        self.menuTools.setObjectName(u"menuTools")
         self.menuHelp = QMenu(self.menubar)
         self.menuHelp.setObjectName(u"menuHelp")
         MainWindow.setMenuBar(self.menubar)
 
         self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuTools.menuAction())
         self.menubar.addAction(self.menuHelp.menuAction())
         self.menuFile.addAction(self.actionNew)
         self.menuFile.addAction(self.actionOpen)
@@ -246,6 +265,10 @@ class Ui_MainWindow(object):
         self.menuFile.addAction(self.actionSave_As)
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionQuit)
+        self.menuTools.addAction(self.actionBenchmark)
+        self.menuTools.addAction(self.actionBenchmarkResults)
+        self.menuTools.addSeparator()
+        self.menuTools.addAction(self.actionResultGrid)
         self.menuHelp.addAction(self.actionHelp)
         self.menuHelp.addAction(self.actionAbout)
 
@@ -281,6 +304,9 @@ class Ui_MainWindow(object):
         self.actionHelp.setShortcut(QCoreApplication.translate("MainWindow", u"F1", None))
 #endif // QT_CONFIG(shortcut)
         self.actionAbout.setText(QCoreApplication.translate("MainWindow", u"&About", None))
+        self.actionBenchmark.setText(QCoreApplication.translate("MainWindow", u"&Benchmark Metadata Strategies", None))
+        self.actionBenchmarkResults.setText(QCoreApplication.translate("MainWindow", u"Benchmark &Result Formats", None))
+        self.actionResultGrid.setText(QCoreApplication.translate("MainWindow", u"Show Results as &Grid", None))
         self.label.setText(QCoreApplication.translate("MainWindow", u"Databases", None))
 #if QT_CONFIG(tooltip)
         self.refresh_button.setToolTip(QCoreApplication.translate("MainWindow", u"Refresh", None))
@@ -297,6 +323,13 @@ class Ui_MainWindow(object):
         self.run_button.setText(QCoreApplication.translate("MainWindow", u"\u25b6", None))
 #if QT_CONFIG(shortcut)
         self.run_button.setShortcut(QCoreApplication.translate("MainWindow", u"F5", None))
+#endif // QT_CONFIG(shortcut)
+#if QT_CONFIG(tooltip)
+        self.cancel_button.setToolTip(QCoreApplication.translate("MainWindow", u"Cancel (Esc)", None))
+#endif // QT_CONFIG(tooltip)
+        self.cancel_button.setText(QCoreApplication.translate("MainWindow", u"\u25a0", None))
+#if QT_CONFIG(shortcut)
+        self.cancel_button.setShortcut(QCoreApplication.translate("MainWindow", u"Esc", None))
 #endif // QT_CONFIG(shortcut)
         self.label_3.setText(QCoreApplication.translate("MainWindow", u"Output", None))
 #if QT_CONFIG(tooltip)
@@ -308,6 +341,7 @@ class Ui_MainWindow(object):
 #endif // QT_CONFIG(tooltip)
         self.query_duration.setText("")
         self.menuFile.setTitle(QCoreApplication.translate("MainWindow", u"&File", None))
+        self.menuTools.setTitle(QCoreApplication.translate("MainWindow", u"&Tools", None))
         self.menuHelp.setTitle(QCoreApplication.translate("MainWindow", u"&Help", None))
     # retranslateUi
 
@@ -4,6 +4,7 @@ import threading
 from PySide6.QtWidgets import (
     QApplication,
     QFileDialog,
+    QHeaderView,
     QMainWindow, 
     QMenu,
     QMessageBox
@@ -14,17 +15,26 @@ from PySide6.QtGui import (
 )
 from PySide6.QtCore import (
     QDir,
+    QTimer,
     Qt,
     Signal,
     Slot
 )
 from SnowQueryUI import Ui_MainWindow
+from SnowQueryResultModel import ResultModel
+from SnowQueryTreeModel import TreeModel
 
 # TODO:
 # Theme toggle
 
 class View(QMainWindow, Ui_MainWindow):
     update_status = Signal(str)
+    update_tree = Signal(list)
+    reset_tree = Signal()
+    query_submitted = Signal(str)
+    query_rows = Signal(str, int)
+    query_finished = Signal(object)
+    benchmark_finished = Signal(str)
 
     def __init__(self):
         ''' Build window '''
@@ -32,18 +42,29 @@ class View(QMainWindow, Ui_MainWindow):
         super().__init__()
         self.setupUi(self)
         self.update_status.connect(self.set_status)
+        self.update_tree.connect(self.add_tree_nodes)
+        self.reset_tree.connect(self.clear_tree_nodes)
+        self.query_submitted.connect(self.set_query_id)
+        self.query_rows.connect(self.show_query_rows)
+        self.query_finished.connect(self.show_query_output)
+        self.benchmark_finished.connect(self.show_benchmark_output)
+
+        # Refresh elapsed time of the running query
+        self.query_timer = QTimer(self)
+        self.query_timer.setInterval(100)
+        self.query_timer.timeout.connect(self.show_query_elapsed)
         
-        # Configure tree
-        self.tree.setColumnCount(4)
-        self.tree.setHeaderLabels([
-            "Name",
-            "Parent",
-            "Formatted Name",
-            "Node Level"
-        ])
-        self.tree.hideColumn(1)
-        self.tree.hideColumn(2)
-        self.tree.hideColumn(3)
+        # Configure tree over the virtualized node store
+        self.tree_model = TreeModel()
+        self.tree.setModel(self.tree_model)
+
+        # Configure result grid over the result store, hidden until chosen
+        # from the Tools menu; fixed row heights keep scrolling independent
+        # of the number of rows
+        self.result_model = ResultModel()
+        self.result_grid.setModel(self.result_model)
+        self.result_grid.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.result_grid.hide()
 
         # Load stylesheets
         self.light_stylesheet = Path("light.qss").read_text()
@@ -71,6 +92,11 @@ class View(QMainWindow, Ui_MainWindow):
         self.actionSave_As.triggered.connect(self.save_file_as)
         self.actionQuit.triggered.connect(self.app.quit)
 
+        # Connect signals and slots for Tools menu
+        self.actionBenchmark.triggered.connect(self.presenter.benchmark_strategies)
+        self.actionBenchmarkResults.triggered.connect(self.presenter.benchmark_result_formats)
+        self.actionResultGrid.toggled.connect(self.presenter.toggle_result_grid)
+
         # Connect signals and slots for Help menu
         self.actionHelp.triggered.connect(self.show_help)
         self.actionAbout.triggered.connect(self.show_about)
@@ -78,11 +104,15 @@ class View(QMainWindow, Ui_MainWindow):
         # Connect signals and slots for buttons
         self.refresh_button.clicked.connect(self.refresh_tree)
         self.run_button.clicked.connect(self.presenter.submit_query)
+        self.cancel_button.clicked.connect(self.presenter.cancel_query)
         self.theme_switch.stateChanged.connect(self.toggle_theme)
 
         # Connect signals and slots tree context menu
         self.tree.customContextMenuRequested.connect(self.show_tree_context_menu)
 
+        # Connect signals and slots for lazy tree loading
+        self.tree.expanded.connect(self.expand_tree_node)
+
         # Default to dark theme
         self.apply_theme("dark")
 
@@ -97,8 +127,60 @@ class View(QMainWindow, Ui_MainWindow):
         ''' Set status '''
         self.status.setText(status)
 
+    @Slot(list)
+    def add_tree_nodes(self, node_records):
+        ''' Add node records sent from the tree building thread '''
+        self.presenter.add_nodes(node_records)
+
+    @Slot()
+    def clear_tree_nodes(self):
+        ''' Clear tree on request from the tree building thread '''
+        self.presenter.clear_nodes()
+
+    @Slot(str)
+    def set_query_id(self, query_id):
+        ''' Show query id sent from the query thread '''
+        self.query_id.setText(query_id)
+
+    @Slot()
+    def show_query_elapsed(self):
+        ''' Show elapsed time of the running query '''
+        self.query_duration.setText(self.presenter.get_query_elapsed())
+
+    @Slot(str, int)
+    def show_query_rows(self, output, rows_fetched):
+        ''' Show a batch of output sent from the query thread '''
+        self.presenter.show_query_rows(output, rows_fetched)
+
+    @Slot(str)
+    def show_benchmark_output(self, output):
+        ''' Show report sent from the benchmark thread '''
+        self.presenter.show_benchmark_output(output)
+
+    @Slot(object)
+    def show_query_output(self, result):
+        ''' Show output sent from the query thread '''
+        self.query_timer.stop()
+        output, query_details = result
+        self.presenter.show_query_output(output, query_details)
+
+    def append_output(self, output, error):
+        ''' Append a batch of query output '''
+        if error:
+            self.output_box.setTextColor("red")
+            self.show_result_grid(False)
+        else:
+            self.output_box.setTextColor(self.theme_text_color)
+        self.output_box.append(output)
+
+    def show_result_grid(self, visible):
+        ''' Show query results in the result grid, or as text in the output box '''
+        self.result_grid.setVisible(visible)
+        self.output_box.setVisible(not visible)
+
     def set_output_values(self, output_values, error):
         ''' Output query results, query id, and query duration '''
+        self.show_result_grid(False)
         if error:
             self.output_box.setTextColor("red")
         else:
@@ -144,7 +226,7 @@ class View(QMainWindow, Ui_MainWindow):
     @Slot()
     def tree_selection_copy(self):
         ''' Copy tree selection '''
-        value = self.tree.currentItem().text(self.presenter.FORMATTED_NAME)
+        value = self.tree_model.node(self.tree.currentIndex()).formatted_name
         if value:
             clipboard = QApplication.clipboard()
             clipboard.clear()
@@ -155,7 +237,7 @@ class View(QMainWindow, Ui_MainWindow):
     @Slot()
     def tree_selection_paste_in_query(self):
         ''' Paste tree selection in query '''
-        value = self.tree.currentItem().text(self.presenter.FORMATTED_NAME)
+        value = self.tree_model.node(self.tree.currentIndex()).formatted_name
         if value:
             self.query_box.insertPlainText(value)
         else:
@@ -164,8 +246,16 @@ class View(QMainWindow, Ui_MainWindow):
     @Slot()
     def refresh_tree_node(self):
         ''' Refresh tree under the selected node '''
-        node = self.tree.currentItem()
-        self.refresh_tree(node=node)
+        index = self.tree.currentIndex()
+        if index.isValid():
+            self.refresh_tree(node=self.tree_model.node(index))
+
+    @Slot()
+    def expand_tree_node(self, index):
+        ''' Load children of a lazily loaded node on first expand '''
+        node = self.tree_model.node(index)
+        if len(node.children) == 1 and node.children[0].node_level == "placeholder":
+            self.refresh_tree(node=node)
 
     @Slot()
     def refresh_tree(self, node=None):
@@ -174,9 +264,9 @@ class View(QMainWindow, Ui_MainWindow):
         if not node:
             node_level = "Root"
         else:
-            node_parent = node.text(self.presenter.PARENT)
-            node_formatted_name = node.text(self.presenter.FORMATTED_NAME)
-            node_level = node.text(self.presenter.NODE_LEVEL)
+            node_parent = node.parent_name()
+            node_formatted_name = node.formatted_name
+            node_level = node.node_level
         
         # Determine scope and get schema object list
         scope = ""
@@ -192,11 +282,11 @@ class View(QMainWindow, Ui_MainWindow):
             if node:
                 # Prune node children
                 status = "Refreshing..."
-                node.takeChildren()
+                self.tree_model.remove_children(node)
             else:
                 # Clear tree
                 status = "Loading databases..."
-                self.tree.clear()
+                self.presenter.clear_nodes()
 
             self.set_status(status)
 
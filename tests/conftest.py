@@ -0,0 +1,58 @@
+import importlib
+from pathlib import Path
+import sys
+
+import pytest
+
+import fake_snowflake
+
+# Each frontend is a self-contained directory of SnowQuery modules
+FRONTENDS = ['tkinter', 'qt', 'psg']
+ROOT = Path(__file__).resolve().parent.parent
+
+fake_snowflake.install()
+
+def purge_modules():
+    ''' Forget imported SnowQuery modules, so the next frontend imports its own copies '''
+    for name in list(sys.modules):
+        if name.startswith('SnowQuery') or name == 'SnowflakeConnectionPK':
+            del sys.modules[name]
+
+def use_frontend(monkeypatch, frontend):
+    ''' Put the frontend's modules first on the path, in place of any imported before '''
+    directory = ROOT / frontend
+    purge_modules()
+    monkeypatch.syspath_prepend(str(directory))
+    if not (directory / 'SnowflakeConnectionPK.py').exists():
+        sys.modules['SnowflakeConnectionPK'] = fake_snowflake.connection_parameters_module()
+
+@pytest.fixture(params=FRONTENDS)
+def frontend(request, monkeypatch, tmp_path):
+    ''' Put one frontend's modules on the path, with the metadata cache under a temporary home '''
+    monkeypatch.setenv('HOME', str(tmp_path))
+    use_frontend(monkeypatch, request.param)
+    yield request.param
+    purge_modules()
+
+@pytest.fixture
+def make_model(frontend):
+    ''' Build models of the frontend on fake connections, closing them afterwards '''
+    pytest.importorskip('prettytable')
+    model_module = importlib.import_module('SnowQueryModel')
+    models = []
+
+    def make(connection=None, **options):
+        ''' Build a model with the given options, reading metadata with plain SHOW commands '''
+        if connection is None:
+            connection = fake_snowflake.FakeConnection()
+        model = model_module.Model(connection=connection, **options)
+
+        # The fake connection answers plain SHOW commands only
+        model.strategy_by_level = {}
+        model.default_strategy = 'show'
+        models.append(model)
+        return model
+
+    yield make
+    for model in models:
+        model.close()
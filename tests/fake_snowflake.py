@@ -0,0 +1,340 @@
+''' In-memory stand-in for a Snowflake connection, with injected latency and errors '''
+import re
+import sys
+import threading
+import time
+import types
+
+try:
+    import snowflake.connector
+except ImportError:
+    snowflake = None
+
+class Error(Exception):
+    ''' Base of the stand-in connector errors, taking the same keywords as the connector's '''
+
+    def __init__(self, msg=None, errno=None, sqlstate=None, sfqid=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+        self.sqlstate = sqlstate
+        self.sfqid = sfqid
+
+class ProgrammingError(Error):
+    pass
+
+class OperationalError(Error):
+    pass
+
+class HttpError(Error):
+    pass
+
+class TooManyRequests(Error):
+    pass
+
+class ServiceUnavailableError(Error):
+    pass
+
+class GatewayTimeoutError(Error):
+    pass
+
+class OtherHTTPRetryableError(Error):
+    pass
+
+class NotSupportedError(Error):
+    pass
+
+def install():
+    ''' Register a stand-in snowflake.connector module when the connector is not installed '''
+    if snowflake is not None:
+        return
+    errors = types.ModuleType('snowflake.connector.errors')
+    for error in (
+        Error, ProgrammingError, OperationalError, HttpError, TooManyRequests,
+        ServiceUnavailableError, GatewayTimeoutError, OtherHTTPRetryableError, NotSupportedError
+    ):
+        setattr(errors, error.__name__, error)
+    connector = types.ModuleType('snowflake.connector')
+    connector.errors = errors
+    connector.DictCursor = object
+    connector.connect = lambda *args, **kwargs: FakeConnection()
+    package = types.ModuleType('snowflake')
+    package.connector = connector
+    sys.modules.update({
+        'snowflake': package,
+        'snowflake.connector': connector,
+        'snowflake.connector.errors': errors
+    })
+
+def connector_errors():
+    ''' Get the errors module of the connector in use '''
+    return sys.modules['snowflake.connector.errors']
+
+def connection_parameters_module():
+    ''' Build a stand-in for the user's SnowflakeConnectionPK module '''
+    module = types.ModuleType('SnowflakeConnectionPK')
+    module.get_connection_parameters = lambda: {}
+    return module
+
+# Columns of SHOW TERSE output by object type
+SHOW_COLUMNS = {
+    'Databases': ['name'],
+    'Schemas': ['database_name', 'name'],
+    'Functions': ['catalog_name', 'schema_name', 'name', 'arguments', 'is_builtin'],
+    'Procedures': ['catalog_name', 'schema_name', 'name', 'arguments', 'is_builtin']
+}
+OBJECT_COLUMNS = ['database_name', 'schema_name', 'name']
+
+# Rows returned by SHOW without a LIMIT
+SHOW_MAX_ROWS = 10000
+
+SHOW_COMMAND = re.compile(
+    r"SHOW TERSE (?P<object_type>[A-Za-z ]+?)(?: LIKE '(?P<like>(?:[^'\\]|\\.)*)')?"
+    r" IN (?P<scope>ACCOUNT|Database \S+|Schema \S+)"
+    r"(?: LIMIT (?P<limit>\d+)(?: FROM '(?P<start>(?:[^'\\]|\\.)*)')?)?$"
+)
+
+# SELECT over one page of SHOW output, as built by Model.get_page_select
+PAGE_SELECT = re.compile(
+    r'SELECT (?P<columns>(?:(?!SELECT).)*?), "page_name", "page_rows", (?P<condition>.*?) as "keep"',
+    re.DOTALL
+)
+SELECT_ITEM = re.compile(r"""(?:'([^']*)'|(NULL)|"(\w+)")(?: as "(\w+)")?""")
+KEEP_CONDITION = re.compile(r"""TRUE|"(?P<column>\w+)" = '(?P<value>[^']*)'""")
+
+# One SELECT of a bulk metadata view, as built by Model.get_bulk_rows
+BULK_SELECT = re.compile(
+    r"""SELECT '(?P<object_type>[A-Za-z ]+)' as "object_type",.*?"""
+    r"""FROM (?P<source>.+?)\.(?P<view>[A-Z_]+)\s+WHERE (?P<conditions>.*?)(?=\s+UNION ALL|\s+ORDER BY)""",
+    re.DOTALL
+)
+# Signature query of a database, as built by Model.get_database_signatures
+SIGNATURE_QUERY = re.compile(r'from (?P<database>\S+)\.information_schema\.schemata')
+
+SCOPE_CONDITION = re.compile(r"(\w+) = '((?:[^'\\]|\\.)*)'")
+
+def unquote(literal):
+    ''' Get the value of a string literal's contents '''
+    return re.sub(r'\\(.)', r'\1', literal)
+
+def like_pattern(like):
+    ''' Translate a case insensitive LIKE pattern, with backslash escapes, to a regular expression '''
+    parts = []
+    for escaped, wildcard, character in re.findall(r'\\(.)|([%_])|(.)', like):
+        if wildcard:
+            parts.append('.*' if wildcard == '%' else '.')
+        else:
+            parts.append(re.escape(escaped or character))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+def make_objects(databases=2, schemas=2, objects=3, object_types=None):
+    ''' Build (object type, database, schema, name) rows of an account '''
+    if object_types is None:
+        object_types = ['Tables', 'Views', 'Functions']
+    rows = []
+    for database in range(databases):
+        for schema in range(schemas):
+            for object_type in object_types:
+                for position in range(objects):
+                    rows.append((object_type, f'DB{database}', f'S{schema}', f'{object_type[0]}{position}'))
+    return rows
+
+class FakeConnection:
+    ''' Connection answering plain SHOW TERSE commands from a list of objects '''
+
+    def __init__(self, objects=None, latency=None, fail=None):
+        ''' Serve objects from make_objects() rows; latency(query) gives the seconds each
+            query takes, and fail(query) an error to raise, or None '''
+        self.objects = make_objects() if objects is None else objects
+        self.latency = latency or (lambda query: 0)
+        self.fail = fail or (lambda query: None)
+
+        # Last altered time reported for every object
+        self.last_altered = '2026-01-01 00:00:00.000'
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def cursor(self, cursor_class=None):
+        ''' Open a cursor '''
+        return FakeCursor(self)
+
+    def close(self):
+        ''' Close the connection '''
+
+    def databases(self):
+        ''' Get database names in order '''
+        return sorted({database for object_type, database, schema, name in self.objects})
+
+    def show(self, object_type, scope):
+        ''' Get the SHOW rows of an object type in scope, as (name, row) pairs '''
+        names = [part.strip('"') for part in scope.split(' ', 1)[1].split('.')] if ' ' in scope else []
+        if object_type == 'Databases':
+            return [(database, (database,)) for database in self.databases()]
+
+        rows = set()
+        for row_type, database, schema, name in self.objects:
+            if [database, schema][:len(names)] != names:
+                continue
+            if object_type == 'Schemas':
+                rows.add((schema, (database, schema)))
+            elif row_type == object_type:
+                if object_type in ('Functions', 'Procedures'):
+                    arguments = f'{name}(NUMBER) RETURN NUMBER'
+                    is_builtin = 'Y' if name.startswith('SYSTEM$') else 'N'
+                    rows.add((name, (database, schema, name, arguments, is_builtin)))
+                else:
+                    rows.add((name, (database, schema, name)))
+        return sorted(rows)
+
+    def signatures(self, database):
+        ''' Get (schema, object type, object count, last altered) rows of a database '''
+        counts = {}
+        for row_type, row_database, schema, name in self.objects:
+            if row_database == database:
+                counts.setdefault((schema, 'Schemas'), 1)
+                counts[schema, row_type] = counts.get((schema, row_type), 0) + 1
+        return [[schema, object_type, count, self.last_altered] for (schema, object_type), count in sorted(counts.items())]
+
+    def bulk(self, select):
+        ''' Get (object type, database, schema, name) rows of one SELECT from a bulk view '''
+        names = [None, None]
+        if select['source'].endswith('.INFORMATION_SCHEMA'):
+            names[0] = select['source'].rsplit('.', 1)[0].strip('"').replace('""', '"')
+        for column, value in SCOPE_CONDITION.findall(select['conditions']):
+            if column in ('database_name', 'catalog_name') or column.endswith('_catalog'):
+                names[0] = unquote(value)
+            elif column == 'schema_name' or column.endswith('_schema'):
+                names[1] = unquote(value)
+
+        object_type = select['object_type']
+        rows = set()
+        for row_type, database, schema, name in self.objects:
+            if names[0] not in (None, database) or names[1] not in (None, schema):
+                continue
+            if object_type == 'Databases':
+                rows.add((object_type, database, None, database))
+            elif object_type == 'Schemas':
+                rows.add((object_type, database, schema, schema))
+            elif row_type == object_type:
+                if object_type in ('Functions', 'Procedures'):
+                    name = f'{name}(X NUMBER) RETURN NUMBER'
+                rows.add((object_type, database, schema, name))
+        return rows
+
+    def execute(self, cursor, query):
+        ''' Run a query for the cursor, after its injected latency and error '''
+        query = query.strip()
+        with self.lock:
+            self.queries.append(query)
+        time.sleep(self.latency(query))
+        error = self.fail(query)
+        if error is not None:
+            raise error
+
+        if query.lower().startswith('select current_account()'):
+            cursor.description = [('CURRENT_ACCOUNT()',), ('CURRENT_ROLE()',)]
+            cursor.rows = [('FAKE_ACCOUNT', 'FAKE_ROLE')]
+            return
+
+        match = SIGNATURE_QUERY.search(query)
+        if match is not None:
+            cursor.description = [('schema_name',), ('object_type',), ('object_count',), ('last_altered',)]
+            cursor.rows = self.signatures(match['database'].strip('"').replace('""', '"'))
+            return
+
+        selects = list(BULK_SELECT.finditer(query))
+        if selects:
+            cursor.description = [('object_type',), ('database_name',), ('schema_name',), ('name',)]
+            cursor.rows = sorted(
+                (row for select in selects for row in self.bulk(select)),
+                key=lambda row: row[3]
+            )
+            return
+
+        # Anonymous blocks and pipes select from the output of their SHOW commands
+        page_selects = list(PAGE_SELECT.finditer(query))
+        if page_selects:
+            shows = [
+                SHOW_COMMAND.match(line.strip().rstrip(';'))
+                for line in query.splitlines()
+                if line.strip().startswith('SHOW ')
+            ]
+            rows = []
+            for show, page_select in zip(shows, page_selects):
+                description, page_rows = self.page(show, page_select)
+                rows += page_rows
+            cursor.description = description
+            names = [column[0] for column in description]
+            cursor.rows = sorted(rows, key=lambda row: row[names.index('name')])
+            return
+
+        match = SHOW_COMMAND.match(query)
+        if match is None:
+            raise connector_errors().ProgrammingError(msg=f'Unsupported query: {query}', errno=1003)
+        cursor.description, cursor.rows = self.show_output(match)
+
+    def show_output(self, match):
+        ''' Get the description and rows output by a matched SHOW command '''
+        object_type = match['object_type']
+        rows = self.show(object_type, match['scope'])
+        if match['like'] is not None:
+            pattern = like_pattern(unquote(match['like']))
+            rows = [(name, row) for name, row in rows if pattern.fullmatch(name)]
+        if match['start'] is not None:
+            start = unquote(match['start'])
+            rows = [(name, row) for name, row in rows if name > start]
+        description = [(column,) for column in SHOW_COLUMNS.get(object_type, OBJECT_COLUMNS)]
+        return description, [row for name, row in rows[:int(match['limit'] or SHOW_MAX_ROWS)]]
+
+    def page(self, show, page_select):
+        ''' Get the description and rows of a page SELECT over the output of a matched SHOW command '''
+        description, show_rows = self.show_output(show)
+        show_columns = [column[0] for column in description]
+        show_rows = [dict(zip(show_columns, row)) for row in show_rows]
+        page_name = max((row['name'] for row in show_rows), default=None)
+
+        # Columns are 'literal', NULL, or "column", each optionally aliased
+        columns = []
+        for item in SELECT_ITEM.finditer(page_select['columns']):
+            literal, null, column, alias = item.groups()
+            columns.append((alias or column, literal, null, column))
+        condition = KEEP_CONDITION.fullmatch(page_select['condition'])
+
+        rows = []
+        for row in show_rows:
+            keep = condition['column'] is None or row[condition['column']] == condition['value']
+            rows.append((
+                *(literal if literal is not None else None if null else row[column]
+                  for name, literal, null, column in columns),
+                page_name,
+                len(show_rows),
+                keep
+            ))
+        names = [name for name, literal, null, column in columns] + ['page_name', 'page_rows', 'keep']
+        return [(name,) for name in names], rows
+
+class FakeCursor:
+    ''' Cursor over the rows of the last query run on a fake connection '''
+
+    def __init__(self, connection):
+        ''' Open cursor on the connection '''
+        self.connection = connection
+        self.description = []
+        self.rows = []
+        self.sfqid = None
+
+    def execute(self, query, *args, **kwargs):
+        ''' Run query '''
+        self.connection.execute(self, query)
+        return self
+
+    def fetchone(self):
+        ''' Get the first row '''
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        ''' Get all rows '''
+        return list(self.rows)
+
+    def close(self):
+        ''' Close the cursor '''
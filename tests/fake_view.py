@@ -0,0 +1,50 @@
+''' Stand-in for any frontend's view, recording what presenters send to it '''
+
+class FakeSignal:
+    ''' Qt signal stand-in recording what is emitted '''
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, *args):
+        self.emitted.append(args)
+
+class FakeWindow:
+    ''' Tk window stand-in recording scheduled callbacks '''
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+class FakeView:
+    ''' View stand-in recording tree updates, events, status, and output '''
+
+    def __init__(self):
+        self.update_tree = FakeSignal()
+        self.update_status = FakeSignal()
+        self.reset_tree = FakeSignal()
+        self.benchmark_finished = FakeSignal()
+        self.window = FakeWindow()
+        self.tree_events = []
+        self.query_events = []
+        self.statuses = []
+        self.outputs = []
+
+    def set_presenter(self, presenter):
+        self.presenter = presenter
+
+    def send_tree_event(self, event, value):
+        self.tree_events.append((event, value))
+
+    def send_query_event(self, event, value):
+        self.query_events.append((event, value))
+
+    def set_status(self, status):
+        self.statuses.append(status)
+
+    set_status_bar = set_status
+
+    def set_output_values(self, output_values, error):
+        self.outputs.append(output_values)
@@ -0,0 +1,74 @@
+import importlib
+import threading
+
+import pytest
+
+import fake_snowflake
+from fake_view import FakeView
+
+def make_presenter(model):
+    ''' Connect the frontend's presenter to model and a fake view '''
+    view = FakeView()
+    presenter = importlib.import_module('SnowQueryPresenter').Presenter(model, view)
+    return presenter, view
+
+def wait_for_report(frontend, presenter, view):
+    ''' Wait for the benchmark thread to deliver its report through the view's mechanism '''
+    for thread in threading.enumerate():
+        if thread.name.startswith('Thread') and thread is not threading.current_thread():
+            thread.join(5)
+    if frontend == 'qt':
+        (output,), = view.benchmark_finished.emitted
+    elif frontend == 'psg':
+        (event, output), = view.query_events
+        assert event == '-BENCHMARK-FINISHED-'
+    else:
+        output = presenter.benchmark_queue.get(timeout=5)
+    return output
+
+def test_benchmark_runs_on_a_worker_thread(frontend, make_model):
+    presenter, view = make_presenter(make_model())
+    release = threading.Event()
+    benchmark_threads = []
+
+    def benchmark():
+        benchmark_threads.append(threading.current_thread())
+        release.wait(5)
+        return 'report'
+
+    presenter.start_benchmark('Benchmarking...', benchmark)
+
+    # The GUI thread is free while the benchmark runs, and a second one is refused
+    assert presenter.benchmark_running
+    presenter.start_benchmark('Benchmarking...', benchmark)
+    assert view.statuses[-1] == 'A query or benchmark is already running'
+
+    release.set()
+    assert wait_for_report(frontend, presenter, view) == 'report'
+    assert benchmark_threads[0] is not threading.current_thread()
+
+def test_strategy_benchmark_report(frontend, make_model):
+    presenter, view = make_presenter(make_model())
+    presenter.benchmark_strategies()
+    output = str(wait_for_report(frontend, presenter, view))
+    assert 'Strategy' in output
+    assert 'InformationSchema' not in output and 'information_schema' not in output
+
+def test_saved_strategies_outside_the_set_are_ignored(frontend, make_model):
+    pytest.importorskip('prettytable')
+    model = make_model()
+    model.cache.put_strategy(model.account, model.role, 'ACCOUNT', 'information_schema')
+    model.cache.put_strategy(model.account, model.role, 'DATABASE', 'pipe')
+
+    model_module = importlib.import_module('SnowQueryModel')
+    reloaded = model_module.Model(connection=fake_snowflake.FakeConnection())
+    try:
+        assert reloaded.strategy_by_level == {'DATABASE': 'pipe'}
+        assert set(reloaded.strategies) == {'scripting', 'pipe', 'show'}
+    finally:
+        reloaded.close()
+
+def test_result_format_benchmark_report(frontend, make_model):
+    presenter, view = make_presenter(make_model())
+    presenter.benchmark_result_formats()
+    assert wait_for_report(frontend, presenter, view) == 'Run a query to benchmark result formats on its result'
@@ -0,0 +1,51 @@
+import importlib
+
+import pytest
+
+import fake_snowflake
+
+def fail_in_database(database, errno):
+    ''' Fail reads of the database's INFORMATION_SCHEMA with the given error number '''
+    def fail(query):
+        if f'{database}.INFORMATION_SCHEMA.' in query:
+            return fake_snowflake.connector_errors().ProgrammingError(msg='SQL compilation error', errno=errno)
+        return None
+    return fail
+
+def test_information_schema_load_matches_show_load(make_model):
+    show_nodes = make_model().get_schema_object_list('Root', 'ACCOUNT')
+    connection = fake_snowflake.FakeConnection()
+    bulk_nodes = make_model(connection, metadata_source='information_schema').get_schema_object_list('Root', 'ACCOUNT')
+
+    assert sorted(bulk_nodes) == sorted(show_nodes)
+    assert any('DB1.INFORMATION_SCHEMA.TABLES' in query for query in connection.queries)
+
+def test_information_schema_load_of_a_database(make_model):
+    show_nodes = make_model().get_schema_object_list('Database', 'Database DB1')
+    model = make_model(metadata_source='information_schema')
+    assert sorted(model.get_schema_object_list('Database', 'Database DB1')) == sorted(show_nodes)
+
+def test_information_schema_load_leaves_out_unauthorized_database(make_model):
+    connection = fake_snowflake.FakeConnection(fail=fail_in_database('DB1', 2003))
+    nodes = make_model(connection, metadata_source='information_schema').get_schema_object_list('Root', 'ACCOUNT')
+
+    assert {node.formatted_name for node in nodes if node.object_type == 'Database'} == {'DB0', 'DB1'}
+    assert {node.parent for node in nodes if node.object_type == 'Schema'} == {'DB0'}
+    assert {node.parent.split('.')[0] for node in nodes if node.object_type == 'Tables'} == {'DB0'}
+
+def test_information_schema_load_reports_other_errors(make_model):
+    connection = fake_snowflake.FakeConnection(fail=fail_in_database('DB1', 1003))
+    model = make_model(connection, metadata_source='information_schema')
+
+    with pytest.raises(fake_snowflake.connector_errors().ProgrammingError):
+        model.get_schema_object_list('Root', 'ACCOUNT')
+
+def test_no_pool_without_bulk_types(make_model, monkeypatch):
+    model = make_model(metadata_source='information_schema')
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError('pool started without bulk views to read')
+    monkeypatch.setattr(importlib.import_module('SnowQueryModel'), 'ThreadPoolExecutor', no_pool)
+
+    metadata = dict(model.iter_bulk_metadata(['Databases'], 'ACCOUNT'))
+    assert metadata['Databases'] == ['DB0', 'DB1']
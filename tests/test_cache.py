@@ -0,0 +1,35 @@
+import importlib
+
+import pytest
+
+from conftest import FRONTENDS, purge_modules, use_frontend
+import fake_snowflake
+
+def build_model():
+    ''' Build the imported frontend's model on a fake connection '''
+    model = importlib.import_module('SnowQueryModel').Model(connection=fake_snowflake.FakeConnection())
+    model.strategy_by_level = {}
+    model.default_strategy = 'show'
+    return model
+
+def test_cache_file_per_frontend(frontend, make_model, tmp_path):
+    make_model().get_schema_object_list('Root', 'ACCOUNT')
+    assert [path.name for path in (tmp_path / '.snowquery').iterdir()] == [f'metadata_cache_{frontend}.db']
+
+def test_frontends_do_not_share_cached_trees(monkeypatch, tmp_path):
+    pytest.importorskip('prettytable')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    try:
+        for frontend in FRONTENDS:
+            use_frontend(monkeypatch, frontend)
+            model = build_model()
+            try:
+                # Each frontend finds no tree cached by the others, and then
+                # finds the tree it cached itself
+                assert model.get_cached_schema_object_list('Root', 'ACCOUNT') is None
+                nodes = model.get_schema_object_list('Root', 'ACCOUNT')
+                assert model.get_cached_schema_object_list('Root', 'ACCOUNT') == nodes
+            finally:
+                model.close()
+    finally:
+        purge_modules()
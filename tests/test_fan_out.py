@@ -0,0 +1,33 @@
+import pytest
+
+import fake_snowflake
+
+def fail_in_database(database, errno):
+    ''' Fail SHOW commands in the database with the given error number '''
+    def fail(query):
+        if f'IN Database {database} ' in query:
+            return fake_snowflake.connector_errors().ProgrammingError(msg='SQL compilation error', errno=errno)
+        return None
+    return fail
+
+def test_fan_out_matches_account_wide_load(make_model):
+    account_nodes = make_model().get_schema_object_list('Root', 'ACCOUNT')
+    connection = fake_snowflake.FakeConnection()
+    fan_out_nodes = make_model(connection, fan_out_databases=True).get_schema_object_list('Root', 'ACCOUNT')
+
+    assert sorted(fan_out_nodes) == sorted(account_nodes)
+    assert any('IN Database DB1 ' in query for query in connection.queries)
+
+def test_fan_out_leaves_out_unauthorized_database(make_model):
+    connection = fake_snowflake.FakeConnection(fail=fail_in_database('DB1', 2003))
+    nodes = make_model(connection, fan_out_databases=True).get_schema_object_list('Root', 'ACCOUNT')
+
+    assert {node.formatted_name for node in nodes if node.object_type == 'Database'} == {'DB0', 'DB1'}
+    assert {node.parent for node in nodes if node.object_type == 'Schema'} == {'DB0'}
+
+def test_fan_out_reports_other_errors(make_model):
+    connection = fake_snowflake.FakeConnection(fail=fail_in_database('DB1', 1003))
+    model = make_model(connection, fan_out_databases=True)
+
+    with pytest.raises(fake_snowflake.connector_errors().ProgrammingError):
+        model.get_schema_object_list('Root', 'ACCOUNT')
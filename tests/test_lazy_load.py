@@ -0,0 +1,73 @@
+import importlib
+
+import fake_snowflake
+from fake_view import FakeView
+
+def tree_nodes(frontend, presenter, view):
+    ''' Get (parent, node level) of each node the presenter sent to the view '''
+    if frontend == 'qt':
+        return [
+            (record[1], record[3])
+            for (node_records,) in view.update_tree.emitted
+            for record in node_records
+        ]
+    if frontend == 'psg':
+        return [
+            (parent, values[0])
+            for event, node_records in view.tree_events if event == '-TREE-NODES-'
+            for parent, key, text, values in node_records
+        ]
+    nodes = []
+    while not presenter.tree_queue.empty():
+        update = presenter.tree_queue.get()
+        if update[0] == 'node':
+            nodes.append((update[1], update[4]))
+    return nodes
+
+def show_types(connection, scope='ACCOUNT'):
+    ''' Get the object types listed by SHOW commands in scope '''
+    return {
+        match['object_type']
+        for match in map(fake_snowflake.SHOW_COMMAND.match, connection.queries)
+        if match and match['scope'] == scope
+    }
+
+def load_root(frontend, model, lazy_load):
+    ''' Build the root of the tree through the frontend's presenter '''
+    presenter_module = importlib.import_module('SnowQueryPresenter')
+    view = FakeView()
+    presenter = presenter_module.Presenter(model, view, lazy_load=lazy_load)
+    presenter.build_tree('Root', 'ACCOUNT')
+    return tree_nodes(frontend, presenter, view)
+
+def test_lazy_load_option(frontend):
+    parse_options = importlib.import_module('SnowQueryOptions').parse_options
+    assert parse_options([]).lazy_load is False
+    assert parse_options(['--lazy-load']).lazy_load is True
+
+def test_eager_load_lists_every_object_type(frontend, make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = make_model(connection)
+    nodes = load_root(frontend, model, lazy_load=False)
+
+    assert show_types(connection) == {'Databases', 'Schemas', *model.object_types}
+    levels = {level for parent, level in nodes}
+    assert {'Database', 'Schema', 'leaf'} <= levels
+    assert 'placeholder' not in levels
+
+def test_lazy_load_lists_only_databases(frontend, make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = make_model(connection)
+    nodes = load_root(frontend, model, lazy_load=True)
+
+    assert show_types(connection) == {'Databases'}
+    assert [level for parent, level in nodes] == ['Database', 'placeholder', 'Database', 'placeholder']
+    assert [parent for parent, level in nodes if level == 'placeholder'] == ['DB0', 'DB1']
+
+def test_lazy_expand_lists_next_level_only(frontend, make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = make_model(connection)
+    schemas = model.get_schema_object_list('Database', 'Database DB0', lazy=True)
+
+    assert show_types(connection, 'Database DB0') == {'Schemas'}
+    assert [schema.name for schema in schemas] == ['S0', 'S1']
@@ -0,0 +1,96 @@
+import importlib
+import threading
+
+import pytest
+
+import fake_snowflake
+
+def make_limiter(max_limit=8, **options):
+    ''' Build the frontend's limiter, backing off on OSError '''
+    limiter_module = importlib.import_module('SnowQueryLimiter')
+    return limiter_module.ConcurrencyLimiter(max_limit, (OSError,), **options)
+
+def run_slot(limiter, kind=None, error=None):
+    ''' Hold a slot for a query of kind, raising error in it if given '''
+    try:
+        with limiter.slot(kind):
+            if error is not None:
+                raise error
+    except type(error):
+        pass
+
+def throttle(object_type, times, error='OperationalError'):
+    ''' Fail the first SHOW commands for object_type with a transient error of the named class '''
+    failures = [times]
+    lock = threading.Lock()
+
+    def fail(query):
+        with lock:
+            if f'SHOW TERSE {object_type} ' in query and failures[0] > 0:
+                failures[0] -= 1
+                return getattr(fake_snowflake.connector_errors(), error)(msg='Too many requests', errno=429)
+        return None
+    return fail
+
+def test_limiter_starts_at_max_limit(frontend):
+    assert make_limiter().limit == 8
+    assert make_limiter(initial_limit=2).limit == 2
+
+def test_other_errors_keep_the_limit(frontend):
+    limiter = make_limiter()
+    for _ in range(5):
+        run_slot(limiter, error=ValueError('bad name'))
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
+
+def test_backoff_errors_halve_the_limit(frontend):
+    limiter = make_limiter()
+    run_slot(limiter, error=OSError('connection reset'))
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+def test_latency_is_compared_within_a_kind(frontend):
+    limiter = make_limiter(initial_limit=4)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release('fast', 0.01)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release('slow', 1.0)
+    assert limiter.limit > 4
+
+def test_rising_latency_backs_off(frontend):
+    limiter = make_limiter()
+    for latency in (0.01, 0.01, 0.2, 0.2, 0.2):
+        limiter.acquire()
+        limiter.release('kind', latency)
+    assert limiter.limit < 8
+
+def test_mixed_load_keeps_the_limit(make_model):
+    latency = {'Databases': 0.001, 'Schemas': 0.02, 'Tables': 0.04}
+    connection = fake_snowflake.FakeConnection(
+        latency=lambda query: next((seconds for object_type, seconds in latency.items() if object_type in query), 0.01)
+    )
+    model = make_model(connection, fan_out_databases=True)
+    model.get_schema_object_list('Root', 'ACCOUNT')
+    assert model.limiter.limit == model.max_metadata_workers
+
+def test_missing_objects_keep_the_limit(make_model):
+    def fail(query):
+        if 'IN Database DB1 ' in query:
+            return fake_snowflake.connector_errors().ProgrammingError(msg='Object does not exist', errno=2003)
+        return None
+    model = make_model(fake_snowflake.FakeConnection(fail=fail), fan_out_databases=True)
+    model.get_schema_object_list('Root', 'ACCOUNT')
+    assert model.limiter.limit == model.max_metadata_workers
+
+@pytest.mark.parametrize('error', [
+    'OperationalError', 'HttpError', 'TooManyRequests', 'ServiceUnavailableError',
+    'GatewayTimeoutError', 'OtherHTTPRetryableError'
+])
+def test_throttling_backs_off(make_model, error):
+    model = make_model(fake_snowflake.FakeConnection(fail=throttle('Tables', 2, error)))
+    model.resilience.base_delay = 0
+    model.get_schema_object_list('Root', 'ACCOUNT')
+    assert model.limiter.limit < model.max_metadata_workers
+    assert model.resilience.retries == 2
@@ -0,0 +1,24 @@
+import importlib
+
+import pytest
+
+def parse_options(args):
+    ''' Parse command line options with the frontend's parser '''
+    return importlib.import_module('SnowQueryOptions').parse_options(args)
+
+def test_metadata_source_option(frontend):
+    assert parse_options([]).metadata_source == 'show'
+    assert parse_options(['--metadata-source', 'information_schema']).metadata_source == 'information_schema'
+    with pytest.raises(SystemExit):
+        parse_options(['--metadata-source', 'tables'])
+
+def test_metadata_source_reaches_model(frontend, make_model):
+    options = parse_options(['--metadata-source', 'account_usage'])
+    model = make_model(metadata_source=options.metadata_source)
+    assert model.metadata_source == 'account_usage'
+
+def test_fan_out_databases_option(frontend, make_model):
+    assert parse_options([]).fan_out_databases is False
+    options = parse_options(['--fan-out-databases'])
+    model = make_model(fan_out_databases=options.fan_out_databases)
+    assert model.fan_out_databases is True
@@ -0,0 +1,34 @@
+import importlib
+
+import pytest
+
+import fake_snowflake
+
+# Names repeat across databases and schemas, and include LIKE wildcards
+OBJECTS = fake_snowflake.make_objects(databases=2, schemas=2, objects=5) + [
+    ('Tables', 'DB0', 'S0', 'T_1'),
+    ('Tables', 'DB1', 'S1', 'T_1'),
+    ('Tables', 'DB1', 'S1', 'TX1')
+]
+
+def load(make_model, node_level, scope, show_page_size):
+    ''' List the objects under a node, paging SHOW output show_page_size rows at a time '''
+    model = make_model(fake_snowflake.FakeConnection(OBJECTS))
+    model.show_page_size = show_page_size
+    return sorted(model.get_schema_object_list(node_level, scope))
+
+@pytest.mark.parametrize('show_page_size', [1, 2, 3, 7])
+def test_pages_across_shared_names(make_model, show_page_size):
+    assert load(make_model, 'Root', 'ACCOUNT', show_page_size) == load(make_model, 'Root', 'ACCOUNT', 10000)
+
+@pytest.mark.parametrize('show_page_size', [1, 3])
+def test_database_pages_across_shared_names(make_model, show_page_size):
+    nodes = load(make_model, 'Database', 'Database DB1', show_page_size)
+    assert nodes == load(make_model, 'Database', 'Database DB1', 10000)
+    assert len([node for node in nodes if node.object_type == 'Tables']) == 12
+
+def test_like_pattern_escapes_wildcards(frontend):
+    identifier = importlib.import_module('SnowQueryIdentifier')
+    pattern = fake_snowflake.like_pattern(fake_snowflake.unquote(
+        identifier.quote_string(identifier.escape_like('T_1'))[1:-1]))
+    assert pattern.fullmatch('T_1') and not pattern.fullmatch('TX1')
@@ -0,0 +1,60 @@
+import fake_snowflake
+from test_lazy_load import show_types
+
+SCOPE = 'Database DB0'
+
+def signature_queries(connection):
+    ''' Get the signature queries run on the connection '''
+    return [query for query in connection.queries if fake_snowflake.SIGNATURE_QUERY.search(query)]
+
+def fail_signatures(query):
+    ''' Fail signature queries as if INFORMATION_SCHEMA were not authorized '''
+    if fake_snowflake.SIGNATURE_QUERY.search(query):
+        return fake_snowflake.connector_errors().ProgrammingError(msg='Not authorized', errno=2003)
+    return None
+
+def cached_model(make_model, connection):
+    ''' Build a model with the database's object list and signatures cached by a first refresh '''
+    model = make_model(connection)
+    model.get_schema_object_list('Database', SCOPE)
+    model.refresh_schema_object_list('Database', SCOPE)
+    connection.queries.clear()
+    return model
+
+def test_refresh_without_cached_list_skips_signatures(make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = make_model(connection)
+    nodes = model.refresh_schema_object_list('Database', SCOPE)
+
+    assert not signature_queries(connection)
+    assert sorted(nodes) == sorted(make_model().get_schema_object_list('Database', SCOPE))
+
+def test_delta_refresh_fetches_changed_types(make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = cached_model(make_model, connection)
+    connection.objects.append(('Tables', 'DB0', 'S1', 'T9'))
+    nodes = model.refresh_schema_object_list('Database', SCOPE)
+
+    assert show_types(connection, SCOPE) == {'Tables', *model.untracked_types}
+    expected = make_model(fake_snowflake.FakeConnection(connection.objects)).get_schema_object_list('Database', SCOPE)
+    assert sorted(nodes) == sorted(expected)
+    assert 'DB0.S1.T9' in {node.formatted_name for node in nodes}
+
+def test_unchanged_refresh_serves_cached_types(make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = cached_model(make_model, connection)
+    cached_nodes = model.get_cached_schema_object_list('Database', SCOPE)
+    nodes = model.refresh_schema_object_list('Database', SCOPE)
+
+    assert show_types(connection, SCOPE) == set(model.untracked_types)
+    assert sorted(nodes) == sorted(cached_nodes)
+
+def test_signature_failure_falls_back_to_full_refresh(make_model):
+    connection = fake_snowflake.FakeConnection()
+    model = cached_model(make_model, connection)
+    connection.fail = fail_signatures
+    connection.objects.append(('Views', 'DB0', 'S0', 'V9'))
+    nodes = model.refresh_schema_object_list('Database', SCOPE)
+
+    assert show_types(connection, SCOPE) == {'Schemas', *model.object_types}
+    assert 'DB0.S0.V9' in {node.formatted_name for node in nodes}
@@ -0,0 +1,71 @@
+import importlib
+
+import pytest
+
+import fake_snowflake
+from test_limiter import throttle
+
+def make_resilience(**options):
+    ''' Build the frontend's resilience, retrying OSError without waiting '''
+    resilience_module = importlib.import_module('SnowQueryResilience')
+    return resilience_module, resilience_module.Resilience((OSError,), base_delay=0, **options)
+
+def failing(error, calls):
+    ''' Build a function counting its calls in calls and raising error '''
+    def function():
+        calls.append(None)
+        raise error
+    return function
+
+def test_retries_transient_errors(frontend):
+    resilience_module, resilience = make_resilience()
+    outcomes = [OSError('reset'), OSError('reset'), 'rows']
+
+    def function():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert resilience.call(function) == 'rows'
+    assert resilience.retries == 2
+    assert resilience.opened_at is None
+
+def test_other_errors_are_not_retried(frontend):
+    resilience_module, resilience = make_resilience()
+    calls = []
+    with pytest.raises(ValueError):
+        resilience.call(failing(ValueError('bad name'), calls))
+    assert len(calls) == 1
+    assert resilience.failures == 0
+
+def test_circuit_opens_after_threshold(frontend):
+    resilience_module, resilience = make_resilience(max_attempts=3, failure_threshold=3)
+    calls = []
+    with pytest.raises(OSError):
+        resilience.call(failing(OSError('reset'), calls))
+    assert len(calls) == 3
+
+    # Calls fail fast while the circuit is open
+    with pytest.raises(resilience_module.CircuitOpenError):
+        resilience.call(failing(OSError('reset'), calls))
+    assert len(calls) == 3
+    assert resilience.short_circuits == 1
+
+def test_trial_call_closes_circuit(frontend):
+    resilience_module, resilience = make_resilience(max_attempts=1, failure_threshold=1, reset_timeout=0)
+    with pytest.raises(OSError):
+        resilience.call(failing(OSError('reset'), []))
+    assert resilience.opened_at is not None
+
+    assert resilience.call(lambda: 'rows') == 'rows'
+    assert resilience.opened_at is None
+
+def test_retried_load_matches_clean_load(make_model):
+    clean_nodes = make_model().get_schema_object_list('Root', 'ACCOUNT')
+    model = make_model(fake_snowflake.FakeConnection(fail=throttle('Views', 3)))
+    model.resilience.base_delay = 0
+    retried_nodes = model.get_schema_object_list('Root', 'ACCOUNT')
+
+    assert sorted(retried_nodes) == sorted(clean_nodes)
+    assert model.resilience.retries == 3
@@ -0,0 +1,19 @@
+import importlib
+
+import pytest
+
+from fake_view import FakeView
+
+def test_grid_toggle_applies_to_next_query(frontend, make_model):
+    if frontend != 'qt':
+        pytest.skip('Only the Qt frontend has a result grid')
+    view = FakeView()
+    presenter = importlib.import_module('SnowQueryPresenter').Presenter(make_model(), view)
+
+    # Toggling leaves the display of the shown or running result alone
+    presenter.toggle_result_grid(True)
+    assert presenter.result_grid is False
+    assert view.statuses[-1] == 'Results of the next query will be shown as a grid'
+
+    presenter.toggle_result_grid(False)
+    assert view.statuses[-1] == 'Results of the next query will be shown as text'
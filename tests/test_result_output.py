@@ -0,0 +1,27 @@
+import importlib
+
+def format_batches(model, batches):
+    ''' Format batches of (NAME, AMOUNT) rows as the query output does, returning the output lines '''
+    result_store = importlib.import_module('SnowQueryResultStore').ResultStore(['NAME', 'AMOUNT'], ['AMOUNT'])
+    widths = {field_name: len(field_name) for field_name in result_store.field_names}
+    lines = []
+    for position, batch in enumerate(batches):
+        output = model.format_result_rows(result_store, result_store.append(batch), widths, position == 0)
+        lines += output.splitlines()
+    return lines
+
+def separators(line):
+    ''' Get positions of the column separators in an output line '''
+    return [position for position, character in enumerate(line) if character == '|']
+
+def test_batches_line_up(make_model):
+    lines = format_batches(make_model(), [
+        [('a', 1), ('bb', 22)],
+        [('a much longer name', 12345678), ('c', 4)]
+    ])
+
+    assert len(lines) == 6
+    assert len({tuple(separators(line)) for line in lines}) == 1
+    assert lines[4].split('|')[1].strip() == 'a m…'
+    assert lines[4].split('|')[2].strip() == '12345…'
+    assert lines[5].split('|')[2].strip() == '4'
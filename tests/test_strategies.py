@@ -0,0 +1,48 @@
+import pytest
+
+import fake_snowflake
+from test_paging import OBJECTS
+
+# Built-in functions are listed by SHOW but left out of the tree
+BUILTIN_OBJECTS = OBJECTS + [('Functions', 'DB0', 'S0', 'SYSTEM$WAIT')]
+
+def load(make_model, node_level, scope, show_page_size=10000, **options):
+    ''' List the objects under a node with the given model options, returning the nodes and queries run '''
+    connection = fake_snowflake.FakeConnection(BUILTIN_OBJECTS)
+    strategy = options.pop('strategy', 'show')
+    model = make_model(connection, **options)
+    model.default_strategy = strategy
+    model.show_page_size = show_page_size
+    return sorted(model.get_schema_object_list(node_level, scope)), connection.queries
+
+@pytest.mark.parametrize('strategy, marker', [
+    ('scripting', 'RESULT_SCAN(LAST_QUERY_ID())'),
+    ('pipe', '->>')
+])
+@pytest.mark.parametrize('node_level, scope', [('Root', 'ACCOUNT'), ('Database', 'Database DB1')])
+def test_strategy_matches_show(make_model, strategy, marker, node_level, scope):
+    expected, show_queries = load(make_model, node_level, scope)
+    nodes, queries = load(make_model, node_level, scope, strategy=strategy)
+
+    assert nodes == expected
+    assert any(marker in query for query in queries)
+    assert any(node.object_type == 'Functions' for node in nodes)
+    assert 'SYSTEM$WAIT' not in {node.signature and node.signature.name for node in nodes}
+
+@pytest.mark.parametrize('strategy', ['scripting', 'pipe'])
+def test_strategy_pages_across_shared_names(make_model, strategy):
+    expected, show_queries = load(make_model, 'Root', 'ACCOUNT')
+    nodes, queries = load(make_model, 'Root', 'ACCOUNT', 3, strategy=strategy)
+
+    assert nodes == expected
+    assert any(' LIKE ' in query for query in queries)
+
+@pytest.mark.parametrize('show_page_size', [10000, 3])
+def test_batched_matches_show(make_model, show_page_size):
+    expected, show_queries = load(make_model, 'Root', 'ACCOUNT')
+    nodes, queries = load(make_model, 'Root', 'ACCOUNT', show_page_size, metadata_mode='batched')
+
+    assert nodes == expected
+    batched = [query for query in queries if 'SQLID' in query]
+    assert len(batched) == 1
+    assert batched[0].count('SHOW TERSE') > 1
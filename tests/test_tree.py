@@ -0,0 +1,16 @@
+import fake_snowflake
+
+# Database names that need quoting
+OBJECTS = [
+    ('Tables', 'my db', 'S0', 'T0'),
+    ('Tables', 'Sales Data', 'public', 'T0'),
+    ('Tables', 'DB0', 'S0', 'T0')
+]
+
+def test_schema_parents_are_database_keys(make_model):
+    nodes = make_model(fake_snowflake.FakeConnection(OBJECTS)).get_schema_object_list('Root', 'ACCOUNT')
+    databases = {node.formatted_name for node in nodes if node.object_type == 'Database'}
+    schema_parents = {node.parent for node in nodes if node.object_type == 'Schema'}
+
+    assert databases == {'"my db"', '"Sales Data"', 'DB0'}
+    assert schema_parents == databases
@@ -0,0 +1,45 @@
+from functools import lru_cache
+import re
+
+# Unquoted identifiers:
+#   a. Start with letter A-Z or an underscore (_)
+#   b. Contain only letters A-Z, underscores, digits 0-9, and dollar signs ($)
+UNQUOTED_IDENTIFIER = re.compile(r'[A-Z_][A-Z0-9_$]*')
+
+def quote_identifier(id):
+    ''' Quote the identifier; to use the double quote character (") inside a quoted identifier, use two quotes '''
+    return f'''"{id.replace('"','""')}"'''
+
+def format_identifier(id):
+    ''' Quote format the identifier if needed '''
+    if UNQUOTED_IDENTIFIER.fullmatch(id):
+        return id
+    return quote_identifier(id)
+
+@lru_cache(maxsize=4096)
+def format_repeated_identifier(id):
+    ''' Quote format an identifier that recurs across many nodes, such as a database or schema name '''
+    return format_identifier(id)
+
+def format_identifiers(ids):
+    ''' Quote format a column of identifiers '''
+    fullmatch = UNQUOTED_IDENTIFIER.fullmatch
+    return [id if fullmatch(id) else quote_identifier(id) for id in ids]
+
+def quote_string(value):
+    ''' Quote the value as a string literal, escaping backslashes and single quotes '''
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def escape_like(value):
+    ''' Escape LIKE wildcards and backslashes, so a pattern matches the value itself '''
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+# Quoted or unquoted part of a dotted name
+NAME_PART = re.compile(r'("(?:[^"]|"")*")|([^."]+)')
+
+def split_identifier(formatted_name):
+    ''' Split a dotted, quote formatted name into its unquoted identifiers '''
+    return [
+        quoted[1:-1].replace('""', '"') if quoted else unquoted
+        for quoted, unquoted in NAME_PART.findall(formatted_name)
+    ]
@@ -1,22 +1,68 @@
-from string import ascii_uppercase, digits
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from sys import intern
+import time
+from typing import NamedTuple
 
 import prettytable as pt
 from SnowflakeConnectionPK import get_connection_parameters
 import snowflake.connector
-from snowflake.connector import DictCursor
+from SnowQueryCache import Cache
+from SnowQueryIdentifier import (
+    format_identifier,
+    format_identifiers,
+    format_repeated_identifier,
+    escape_like,
+    quote_string,
+    split_identifier
+)
+from SnowQueryLimiter import ConcurrencyLimiter
+from SnowQueryResilience import (
+    CircuitOpenError,
+    Resilience
+)
+from SnowQueryResultStore import (
+    ARROW_AVAILABLE,
+    ArrowResultStore,
+    ResultStore
+)
+from SnowQuerySignature import (
+    load_signature,
+    parse_signature,
+    Signature
+)
+from SnowQueryStrategy import (
+    PipeStrategy,
+    ScriptingStrategy,
+    ShowStrategy
+)
 
-class Model:
-    def __init__(self):
-        ''' Establish connection to Snowflake '''
+# Snowflake error number for an object that does not exist or is not authorized
+OBJECT_NOT_AUTHORIZED = 2003
+
+class SchemaObject(NamedTuple):
+    ''' Tree node for a database, schema, object header, or schema object '''
+    name: str
+    parent: str
+    formatted_name: str
+    object_type: str
 
-        # Load Snowflake connection parameters
-        connection_parameters = get_connection_parameters()
+    # Parsed signature of a function or procedure, for tooltips and autocomplete
+    signature: Signature = None
+
+class Model:
+    def __init__(self, metadata_source='show', connection=None, metadata_mode='parallel', fan_out_databases=False):
+        ''' Establish connection to Snowflake, or use the given connection '''
 
         # Connect to Snowflake and create cursors
-        self.cnxn = snowflake.connector.connect(**connection_parameters)
-        # self.cnxn = snowflake.connector.connect()
+        if connection is None:
+            # Load Snowflake connection parameters
+            connection_parameters = get_connection_parameters()
+            connection = snowflake.connector.connect(**connection_parameters)
+            # connection = snowflake.connector.connect()
+        self.cnxn = connection
         self.cursor = self.cnxn.cursor()
-        self.dcursor = self.cnxn.cursor(DictCursor)
+        self.mcursor = self.cnxn.cursor()
         self.object_types = [
             'Tables',
             'Views',
@@ -31,131 +77,668 @@ class Model:
             'Sequences'
         ]
 
-    def __del__(self):
-        ''' Cleanup connection to Snowflake '''
+        # Metadata fetch mode:
+        #   serial   - one SHOW round trip per object type
+        #   parallel - concurrent SHOW calls, each on its own cursor
+        #   batched  - all SHOW calls in a single anonymous block
+        self.metadata_mode = metadata_mode
+        self.max_metadata_workers = 16
+
+        # Transient network and service errors, including throttling; the
+        # connector's retryable HTTP errors do not subclass OperationalError
+        retryable_errors = (
+            snowflake.connector.errors.OperationalError,
+            snowflake.connector.errors.HttpError,
+            snowflake.connector.errors.TooManyRequests,
+            snowflake.connector.errors.ServiceUnavailableError,
+            snowflake.connector.errors.GatewayTimeoutError,
+            snowflake.connector.errors.OtherHTTPRetryableError,
+            OSError
+        )
+
+        # Concurrent metadata queries are limited adaptively, starting at the
+        # worker count, backing off on retryable errors or rising latency and
+        # growing back while latency is flat
+        self.limiter = ConcurrencyLimiter(self.max_metadata_workers, retryable_errors)
+
+        # Metadata queries are idempotent, so retryable errors are retried;
+        # repeated failures open a circuit breaker that pauses all calls,
+        # including user queries, on the connection
+        self.resilience = Resilience(retryable_errors)
+
+        # Load the account a database at a time: list databases, then run
+        # SHOW calls for each database and object type on the worker pool
+        self.fan_out_databases = fan_out_databases
+
+        # Metadata source:
+        #   show               - SHOW commands, run per the metadata mode
+        #   account_usage      - bulk views in SNOWFLAKE.ACCOUNT_USAGE, which lag by
+        #                        up to two hours and ignore the role's privileges
+        #   information_schema - bulk views in each database's INFORMATION_SCHEMA
+        # Object types without a bulk view always come from SHOW commands
+        self.metadata_source = metadata_source
+
+        # SHOW output is capped at 10,000 rows, so metadata is fetched in
+        # pages of show_page_size rows, each following the last name seen
+        self.show_page_size = 10000
+
+        # Refresh database nodes by re-fetching only object types whose
+        # INFORMATION_SCHEMA signature changed; streams and tasks have no
+        # INFORMATION_SCHEMA view and are always re-fetched
+        self.delta_refresh = True
+        self.untracked_types = ['Streams', 'Tasks']
+
+        # User queries run asynchronously; their status is polled at
+        # intervals doubling from min_poll_interval up to max_poll_interval
+        self.min_poll_interval = 0.1
+        self.max_poll_interval = 2.0
+
+        # Ids of submitted queries whose results have not been collected,
+        # which are cancelled on close so they stop using the warehouse
+        self.running_queries = set()
+
+        # Query results are fetched and formatted fetch_batch_size rows at a
+        # time, so the first rows appear without waiting for the rest
+        self.fetch_batch_size = 1000
+
+        # Query results are stored as the Arrow record batches downloaded by
+        # the connector when pyarrow is installed, or as row tuples otherwise;
+        # result_store holds the result of the last query for rendering
+        self.result_format = 'arrow' if ARROW_AVAILABLE else 'rows'
+        self.result_store = None
+        self.result_query_id = None
+
+        # Local metadata cache, keyed by account, role, and scope; each
+        # frontend has its own file, as tree node parents differ between them
+        self.account, self.role = self.cursor.execute(
+            "select current_account(), current_role()").fetchone()
+        self.cache = Cache('tkinter')
+
+        # Metadata fetch strategies by name, and the strategy used at each
+        # scope level; benchmark_strategies saves the fastest for each level.
+        # The metadata source decides between SHOW commands and bulk views;
+        # for SHOW commands, the metadata mode schedules the calls for several
+        # object types, and the strategy runs and pages each single type's
+        # SHOW command, except in batched mode, whose one anonymous block
+        # replaces the strategy for loads of several types
+        self.strategies = {
+            strategy.name: strategy
+            for strategy in (
+                ScriptingStrategy(self),
+                PipeStrategy(self),
+                ShowStrategy(self)
+            )
+        }
+        self.default_strategy = 'scripting'
+        self.strategy_by_level = {
+            scope_level: strategy
+            for scope_level, strategy in self.cache.get_strategies(self.account, self.role).items()
+            if strategy in self.strategies
+        }
+
+    def close(self):
+        ''' Cancel queries still running, then close connection to Snowflake '''
+        for query_id in list(self.running_queries):
+            try:
+                self.cancel_query(query_id)
+            except Exception:
+                pass
 
         self.cursor.close()
-        self.dcursor.close()
+        self.mcursor.close()
         self.cnxn.close()
+        self.cache.close()
+
+    def get_schema_object_list(self, node_level, scope, lazy=False):
+        ''' Get list of objects under the specified node, or only its next level if lazy '''
+        metadata_types = self.get_metadata_types(node_level, lazy)
+        nodes_by_type = {object_type: [] for object_type in metadata_types}
+        for object_type, position, total, nodes in self.iter_schema_object_list(node_level, scope, lazy):
+            nodes_by_type[object_type] += nodes
+        return self.get_ordered_nodes(metadata_types, nodes_by_type)
+
+    def iter_schema_object_list(self, node_level, scope, lazy=False):
+        ''' Yield (object type, position, total, nodes) as each page of an object type under the node arrives '''
+        add_object_header = node_level not in self.object_types
+        metadata_types = self.get_metadata_types(node_level, lazy)
+
+        # Object headers are shared by all pages of an object type
+        nodes_by_type = {object_type: [] for object_type in metadata_types}
+        object_headers = {object_type: {} for object_type in metadata_types}
+        loaded_types = []
+        for object_type, metadata in self.iter_metadata_by_type(metadata_types, scope):
+            if object_type not in loaded_types:
+                loaded_types.append(object_type)
+            nodes = self.get_nodes(object_type, metadata, add_object_header, object_headers[object_type])
+            nodes_by_type[object_type] += nodes
+            yield object_type, len(loaded_types), len(metadata_types), nodes
+
+        # Cache node list in tree order
+        schema_object_list = self.get_ordered_nodes(metadata_types, nodes_by_type)
+        self.cache.put(self.account, self.role, self.get_cache_level(node_level, lazy), scope, schema_object_list)
 
-    def get_schema_object_list(self, node_level, scope):
-        ''' Get list of objects under the specified node '''
+    def get_ordered_nodes(self, metadata_types, nodes_by_type):
+        ''' Concatenate nodes in tree order '''
         schema_object_list = []
-        add_object_header = True
-        if node_level == 'Root':
-            schema_object_list += self.get_databases(scope)
-            schema_object_list += self.get_schemas(scope)
-            for object_type in self.object_types:
-                schema_object_list += self.get_schema_objects(object_type, scope, add_object_header)
+        for object_type in metadata_types:
+            schema_object_list += nodes_by_type[object_type]
+        return schema_object_list
+
+    def get_cached_schema_object_list(self, node_level, scope, lazy=False):
+        ''' Get cached list of objects under the specified node, or None '''
+        cached_object_list = self.cache.get(self.account, self.role, self.get_cache_level(node_level, lazy), scope)
+        if cached_object_list is None:
+            return None
+        return [
+            SchemaObject(name, parent, formatted_name, object_type, load_signature(signature))
+            for name, parent, formatted_name, object_type, signature in cached_object_list
+        ]
+
+    def get_cache_level(self, node_level, lazy):
+        ''' Get cache key node level, keeping lazy and full node lists apart '''
+        if lazy:
+            return f'{node_level} (lazy)'
+        return node_level
+
+    def refresh_schema_object_list(self, node_level, scope, lazy=False):
+        ''' Refresh list of objects under the specified node, re-fetching only changed object types '''
+        metadata_types = self.get_metadata_types(node_level, lazy)
+        nodes_by_type = {object_type: [] for object_type in metadata_types}
+        for object_type, position, total, nodes in self.iter_refreshed_schema_object_list(node_level, scope, lazy):
+            nodes_by_type[object_type] += nodes
+        return self.get_ordered_nodes(metadata_types, nodes_by_type)
+
+    def iter_refreshed_schema_object_list(self, node_level, scope, lazy=False):
+        ''' Yield (object type, position, total, nodes) for a refresh, re-fetching only changed object types '''
+        if lazy or not self.delta_refresh or node_level != 'Database':
+            yield from self.iter_schema_object_list(node_level, scope, lazy)
+            return
+
+        # Compare server signatures against those saved with the cached list;
+        # without a cached list there is nothing to compare
+        cached_object_list = self.get_cached_schema_object_list(node_level, scope)
+        cached_signatures = self.cache.get_signatures(self.account, self.role, node_level, scope)
+        signatures = None
+        if cached_object_list is not None:
+            try:
+                signatures = self.get_database_signatures(scope)
+            except snowflake.connector.errors.ProgrammingError:
+                # The role may lack INFORMATION_SCHEMA access, or the database
+                # may be gone; a full refresh reports anything it cannot load
+                pass
+        if signatures is None or cached_signatures is None:
+            yield from self.iter_schema_object_list(node_level, scope)
+        else:
+            metadata_types = self.get_metadata_types(node_level)
+            changed_types = self.get_changed_types(cached_signatures, signatures)
+            unchanged_types = [
+                object_type for object_type in metadata_types
+                if object_type not in changed_types
+            ]
+            total = len(metadata_types)
+
+            # Group cached nodes by metadata type
+            cached_nodes = {}
+            for node in cached_object_list:
+                cached_nodes.setdefault(self.get_node_metadata_type(node), []).append(node)
+
+            # Unchanged object types come straight from the cache, once any
+            # changed schemas, the parents of all other nodes, have arrived
+            nodes_by_type = {object_type: [] for object_type in metadata_types}
+            object_headers = {object_type: {} for object_type in metadata_types}
+            loaded_types = []
+            if 'Schemas' not in changed_types:
+                yield from self.iter_cached_types(unchanged_types, cached_nodes, nodes_by_type, loaded_types, total)
+
+            # Re-fetched object types are yielded page by page as they arrive
+            for object_type, metadata in self.iter_metadata_by_type(changed_types, scope):
+                if object_type != 'Schemas':
+                    yield from self.iter_cached_types(unchanged_types, cached_nodes, nodes_by_type, loaded_types, total)
+                if object_type not in loaded_types:
+                    loaded_types.append(object_type)
+                nodes = self.get_nodes(object_type, metadata, True, object_headers[object_type])
+                nodes_by_type[object_type] += nodes
+                yield object_type, len(loaded_types), total, nodes
+            yield from self.iter_cached_types(unchanged_types, cached_nodes, nodes_by_type, loaded_types, total)
+
+            schema_object_list = self.get_ordered_nodes(metadata_types, nodes_by_type)
+            self.cache.put(self.account, self.role, node_level, scope, schema_object_list)
+
+        if signatures is not None:
+            self.cache.put_signatures(self.account, self.role, node_level, scope, signatures)
+
+    def iter_cached_types(self, cached_types, cached_nodes, nodes_by_type, loaded_types, total):
+        ''' Yield (object type, position, total, nodes) for object types served from the cache '''
+        while cached_types:
+            object_type = cached_types.pop(0)
+            loaded_types.append(object_type)
+            nodes_by_type[object_type] = cached_nodes.get(object_type, [])
+            yield object_type, len(loaded_types), total, nodes_by_type[object_type]
+
+    def get_database_signatures(self, scope):
+        ''' Get object count and last altered time per schema and object type in a database '''
+        database = scope.split(' ', 1)[1]
+        query = f"""
+            select "schema_name", "object_type", count(*) as "object_count", to_varchar(max("last_altered")) as "last_altered"
+            from (
+                select schema_name as "schema_name", 'Schemas' as "object_type", last_altered as "last_altered"
+                from {database}.information_schema.schemata
+                union all
+                select table_schema,
+                    case
+                        when table_type in ('VIEW', 'MATERIALIZED VIEW') then 'Views'
+                        when is_dynamic = 'YES' then 'Dynamic Tables'
+                        else 'Tables'
+                    end,
+                    last_altered
+                from {database}.information_schema.tables
+                union all
+                select function_schema, 'Functions', last_altered from {database}.information_schema.functions
+                union all
+                select procedure_schema, 'Procedures', last_altered from {database}.information_schema.procedures
+                union all
+                select stage_schema, 'Stages', last_altered from {database}.information_schema.stages
+                union all
+                select file_format_schema, 'File Formats', last_altered from {database}.information_schema.file_formats
+                union all
+                select pipe_schema, 'Pipes', last_altered from {database}.information_schema.pipes
+                union all
+                select sequence_schema, 'Sequences', last_altered from {database}.information_schema.sequences
+            )
+            where "schema_name" <> 'INFORMATION_SCHEMA'
+            group by "schema_name", "object_type"
+            order by "schema_name", "object_type"
+        """
+        cursor = self.cnxn.cursor()
+        try:
+            return [list(row) for row in self.run_metadata_query(self.fetch_rows, cursor, query, kind='signatures')]
+        finally:
+            cursor.close()
+
+    def get_changed_types(self, cached_signatures, signatures):
+        ''' Get metadata types whose signatures differ, plus types without signatures '''
+        cached = {
+            (schema, object_type): (count, last_altered)
+            for schema, object_type, count, last_altered in cached_signatures
+        }
+        current = {
+            (schema, object_type): (count, last_altered)
+            for schema, object_type, count, last_altered in signatures
+        }
+        changed = {
+            object_type
+            for schema, object_type in cached.keys() | current.keys()
+            if cached.get((schema, object_type)) != current.get((schema, object_type))
+        }
+        changed.update(self.untracked_types)
+        return [
+            object_type for object_type in self.get_metadata_types('Database')
+            if object_type in changed
+        ]
+
+    def get_node_metadata_type(self, node):
+        ''' Get the metadata type that produced the node '''
+        object_type = node.object_type
+        if object_type == "object_header":
+            return node.name
+        elif object_type == "Database":
+            return "Databases"
+        elif object_type == "Schema":
+            return "Schemas"
+        return object_type
+
+    def get_metadata_types(self, node_level, lazy=False):
+        ''' Get metadata types to retrieve under the specified node level '''
+        if node_level == 'Root' and lazy:
+            return ['Databases']
+        elif node_level == 'Root':
+            return ['Databases', 'Schemas'] + self.object_types
+        elif node_level == 'Database' and lazy:
+            return ['Schemas']
         elif node_level == 'Database':
-            schema_object_list += self.get_schemas(scope)
-            for object_type in self.object_types:
-                schema_object_list += self.get_schema_objects(object_type, scope, add_object_header)
+            return ['Schemas'] + self.object_types
         elif node_level == 'Schema':
-            for object_type in self.object_types:
-                schema_object_list += self.get_schema_objects(object_type, scope, add_object_header)
+            return list(self.object_types)
         elif node_level in self.object_types:
-            add_object_header = False
-            schema_object_list += self.get_schema_objects(node_level, scope, add_object_header)
-        return schema_object_list
+            return [node_level]
+        return []
+
+    def iter_metadata_by_type(self, metadata_types, scope):
+        ''' Yield (object type, metadata) as each page of metadata arrives, using the configured metadata source '''
+        if self.metadata_source == 'show':
+            yield from self.iter_show_metadata(metadata_types, scope)
+        else:
+            yield from self.iter_bulk_metadata(metadata_types, scope)
+
+    def iter_show_metadata(self, metadata_types, scope):
+        ''' Yield (object type, metadata) as each page of SHOW output arrives, using the configured metadata mode '''
+        if self.fan_out_databases and scope == 'ACCOUNT' and metadata_types != ['Databases']:
+            yield from self.iter_metadata_by_database(metadata_types, scope)
+        elif self.metadata_mode == 'batched' and len(metadata_types) > 1:
+            yield from self.get_batched_metadata(metadata_types, scope).items()
+        elif self.metadata_mode == 'parallel' and len(metadata_types) > 1:
+            yield from self.iter_metadata_concurrently(metadata_types, scope)
+        else:
+            for object_type in metadata_types:
+                for metadata in self.iter_metadata_pages(object_type, scope):
+                    yield object_type, metadata
+
+    def iter_bulk_metadata(self, metadata_types, scope):
+        ''' Yield (object type, metadata) from bulk metadata views, then SHOW output for types without one '''
+        bulk_types = [
+            object_type for object_type in metadata_types
+            if self.get_bulk_view(object_type)
+            and not (object_type == 'Databases' and self.metadata_source == 'information_schema')
+        ]
+        show_types = [
+            object_type for object_type in metadata_types
+            if object_type not in bulk_types
+        ]
+
+        # Unquoted database and schema names of the scope
+        scope_names = split_identifier(scope.split(' ', 1)[1]) if ' ' in scope else []
+
+        if self.metadata_source == 'account_usage':
+            rows = self.get_bulk_rows(bulk_types, 'SNOWFLAKE.ACCOUNT_USAGE', scope_names, self.mcursor)
+        else:
+            # Databases are listed by SHOW, then each one's views are read concurrently
+            if 'Databases' in show_types:
+                show_types.remove('Databases')
+                databases = self.get_metadata('Databases', scope)
+                yield 'Databases', databases
+            elif scope_names:
+                databases = scope_names[:1]
+            elif bulk_types:
+                databases = self.get_metadata('Databases', scope)
+            else:
+                databases = []
+            sources = [self.get_information_schema(database) for database in databases]
+            rows = []
+            if sources and bulk_types:
+                max_workers = min(self.max_metadata_workers, len(sources))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for source_rows in executor.map(
+                        self.get_bulk_rows_with_cursor,
+                        [bulk_types] * len(sources),
+                        sources,
+                        [scope_names] * len(sources)
+                    ):
+                        rows += source_rows
+
+                # Merge databases back into SHOW order
+                rows.sort(key=lambda row: row[3])
+
+        yield from self.split_bulk_rows(bulk_types, rows).items()
+
+        if show_types:
+            yield from self.iter_show_metadata(show_types, scope)
+
+    def split_bulk_rows(self, object_types, rows):
+        ''' Split (object type, database, schema, name) rows into per type metadata '''
+        metadata = {object_type: [] for object_type in object_types}
+        for object_type, db, schema, name in rows:
+            if object_type == 'Databases':
+                metadata[object_type].append(name)
+            elif object_type == 'Schemas':
+                metadata[object_type].append((db, name))
+            elif object_type in ('Functions', 'Procedures'):
+                metadata[object_type].append((db, schema, parse_signature(name, named=True).arguments()))
+            else:
+                metadata[object_type].append((db, schema, name))
+        return metadata
+
+    def get_information_schema(self, database):
+        ''' Get the INFORMATION_SCHEMA of the unquoted database name '''
+        return f'{format_identifier(database)}.INFORMATION_SCHEMA'
+
+    def get_bulk_view(self, object_type):
+        ''' Get (view, database column, schema column, name expression, condition) of the bulk view for the object type, or None '''
+        if object_type == 'Databases':
+            return 'DATABASES', 'database_name', 'NULL', 'database_name', 'TRUE'
+        elif object_type == 'Schemas':
+            return 'SCHEMATA', 'catalog_name', 'schema_name', 'schema_name', 'TRUE'
+        elif object_type == 'Tables':
+            return 'TABLES', 'table_catalog', 'table_schema', 'table_name', """table_type in ('BASE TABLE', 'TEMPORARY TABLE')"""
+        elif object_type == 'Views':
+            return 'TABLES', 'table_catalog', 'table_schema', 'table_name', """table_type in ('VIEW', 'MATERIALIZED VIEW')"""
+        elif object_type == 'Dynamic Tables':
+            return 'TABLES', 'table_catalog', 'table_schema', 'table_name', """is_dynamic = 'YES'"""
+        elif object_type in ('Functions', 'Procedures'):
+            # Argument names are dropped client-side to match SHOW arguments
+            prefix = object_type[:-1].lower()
+            name = f"""{prefix}_name || argument_signature || ' RETURN ' || data_type"""
+            return object_type.upper(), f'{prefix}_catalog', f'{prefix}_schema', name, 'TRUE'
+        elif object_type in ('Stages', 'File Formats', 'Pipes', 'Sequences'):
+            prefix = object_type[:-1].lower().replace(' ', '_')
+            return object_type.upper().replace(' ', '_'), f'{prefix}_catalog', f'{prefix}_schema', f'{prefix}_name', 'TRUE'
+        return None
+
+    def get_bulk_rows(self, object_types, source, scope_names, cursor):
+        ''' Get (object type, database, schema, name) rows for the object types from the bulk views of source '''
+        if not object_types:
+            return []
+
+        selects = []
+        for object_type in object_types:
+            view, database_column, schema_column, name, condition = self.get_bulk_view(object_type)
+            conditions = [condition]
+            if source == 'SNOWFLAKE.ACCOUNT_USAGE':
+                conditions.append('deleted is null')
+            for column, scope_name in zip((database_column, schema_column), scope_names):
+                conditions.append(f'{column} = {quote_string(scope_name)}')
+            selects.append(f"""
+                SELECT '{object_type}' as "object_type", {database_column} as "database_name", {schema_column} as "schema_name", {name} as "name"
+                FROM {source}.{view}
+                WHERE {' and '.join(conditions)}""")
+        union = """
+                UNION ALL""".join(selects)
+
+        # Build and execute query
+        query = f"""{union}
+                ORDER BY "name"
+        """
+        return self.run_metadata_query(self.fetch_rows, cursor, query, kind=source)
+
+    def get_bulk_rows_with_cursor(self, object_types, source, scope_names):
+        ''' Get bulk view rows of one database on its own cursor '''
+        cursor = self.cnxn.cursor()
+        try:
+            return self.get_bulk_rows(object_types, source, scope_names, cursor)
+        except snowflake.connector.errors.ProgrammingError as e:
+            # Databases the role can see but not read are left out, as in
+            # SHOW output; any other error is reported
+            if e.errno != OBJECT_NOT_AUTHORIZED:
+                raise
+            return []
+        finally:
+            cursor.close()
 
-    def get_databases(self, scope):
-        ''' Get databases '''
-        dbs = self.get_metadata('Databases', scope)
+    def get_nodes(self, object_type, metadata, add_object_header, object_headers=None):
+        ''' Build tree nodes from metadata of the given type '''
+        if object_type == 'Databases':
+            return self.get_databases(metadata)
+        elif object_type == 'Schemas':
+            return self.get_schemas(metadata)
+        return self.get_schema_objects(object_type, metadata, add_object_header, object_headers)
+
+    def iter_metadata_concurrently(self, metadata_types, scope):
+        ''' Run paged metadata queries on a bounded worker pool, yielding pages as they arrive '''
+        max_workers = min(self.max_metadata_workers, len(metadata_types))
+        pages = Queue()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.queue_metadata_pages, object_type, scope, pages)
+                for object_type in metadata_types
+            ]
+
+            # Databases and schemas are parents of all other nodes, so hold
+            # back pages of other object types until they have been yielded
+            parent_types = [
+                object_type for object_type in metadata_types
+                if object_type in ('Databases', 'Schemas')
+            ]
+            held_pages = {object_type: [] for object_type in metadata_types}
+            finished_types = set()
+            while len(finished_types) < len(metadata_types):
+                object_type, metadata = pages.get()
+                if metadata is None:
+                    finished_types.add(object_type)
+                else:
+                    held_pages[object_type].append(metadata)
+                while parent_types:
+                    parent_type = parent_types[0]
+                    while held_pages[parent_type]:
+                        yield parent_type, held_pages[parent_type].pop(0)
+                    if parent_type not in finished_types:
+                        break
+                    parent_types.pop(0)
+                if not parent_types:
+                    for held_type, metadata_pages in held_pages.items():
+                        while metadata_pages:
+                            yield held_type, metadata_pages.pop(0)
+
+            # Raise any error from the workers
+            for future in futures:
+                future.result()
+
+    def queue_metadata_pages(self, object_type, scope, pages):
+        ''' Queue pages of metadata fetched on its own cursor, followed by None when done '''
+        cursor = self.cnxn.cursor()
+        try:
+            for metadata in self.iter_metadata_pages(object_type, scope, cursor):
+                pages.put((object_type, metadata))
+        finally:
+            cursor.close()
+            pages.put((object_type, None))
+
+    def iter_metadata_by_database(self, metadata_types, scope):
+        ''' Yield (object type, metadata) for the account from concurrent per database SHOW calls '''
+        databases = []
+        for metadata in self.iter_metadata_pages('Databases', scope):
+            databases += metadata
+            if 'Databases' in metadata_types:
+                yield 'Databases', metadata
+
+        database_types = [
+            object_type for object_type in metadata_types
+            if object_type != 'Databases'
+        ]
+        if not databases or not database_types:
+            return
+        max_workers = min(self.max_metadata_workers, len(databases) * len(database_types))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                [
+                    executor.submit(self.get_database_metadata, object_type, f'Database {format_identifier(database)}')
+                    for object_type in database_types
+                ]
+                for database in databases
+            ]
 
+            # Merge each database as it finishes, in database order, so the
+            # node list, and the cache that holds it, is the same every load
+            for database_futures in futures:
+                for object_type, future in zip(database_types, database_futures):
+                    for metadata in future.result():
+                        yield object_type, metadata
+
+    def get_database_metadata(self, object_type, scope):
+        ''' Get pages of metadata of one object type in one database on its own cursor '''
+        cursor = self.cnxn.cursor()
+        try:
+            return list(self.iter_metadata_pages(object_type, scope, cursor))
+        except snowflake.connector.errors.ProgrammingError as e:
+            # Databases the role can see but not use are left out, as in
+            # account-wide SHOW output; any other error is reported
+            if e.errno != OBJECT_NOT_AUTHORIZED:
+                raise
+            return []
+        finally:
+            cursor.close()
+
+    def get_databases(self, dbs):
+        ''' Build database nodes from metadata '''
         db_list = []
-        for db in dbs:
+        for db, formatted_db in zip(dbs, format_identifiers(dbs)):
             db_list.append(
-                {
-                    "parent": "",
-                    "name": db,
-                    "formatted_name": self.format_identifier(db),
-                    "object_type": "Database"
-                }
+                SchemaObject(
+                    db,
+                    "",
+                    intern(formatted_db),
+                    "Database"
+                )
             )
         return db_list
 
-    def get_schemas(self, scope):
-        ''' Get database schemas '''
-        schemas = self.get_metadata('Schemas', scope)
-
+    def get_schemas(self, schemas):
+        ''' Build database schema nodes from metadata '''
         schema_list = []
         for db, schema in schemas:
-            formatted_db = f'{self.format_identifier(db)}'
-            formatted_schema = f'{self.format_identifier(schema)}'
+            formatted_db = intern(format_repeated_identifier(db))
+            formatted_schema = format_identifier(schema)
             schema_list.append(
-                {
-                    "parent": formatted_db,
-                    "name": schema,
-                    "formatted_name": f"{formatted_db}.{formatted_schema}",
-                    "object_type": "Schema"
-                }
+                SchemaObject(
+                    schema,
+                    formatted_db,
+                    intern(f"{formatted_db}.{formatted_schema}"),
+                    "Schema"
+                )
             )
         return schema_list
 
-    def get_schema_objects(self, object_type, scope, add_object_header):
-        ''' Get schema objects'''
-        schema_objects = self.get_metadata(object_type, scope)
-
+    def get_schema_objects(self, object_type, schema_objects, add_object_header, object_headers=None):
+        ''' Build schema object nodes from metadata '''
         schema_object_list = []
-        object_headers = []
-        for db, schema, name in schema_objects:
-            formatted_db = f'{self.format_identifier(db)}'
-            formatted_schema = f'{self.format_identifier(schema)}'
-            formatted_name = f'{self.format_identifier(name)}'
-            object_header = {
-                "parent": f"{formatted_db}.{formatted_schema}",
-                "name": object_type,
-                "formatted_name": f'{formatted_db}.{formatted_schema}.{object_type}',
-                "object_type": "object_header"
-            }
-            if add_object_header and object_header not in object_headers:
-                schema_object_list.append(object_header)
-                object_headers.append(object_header)
+
+        # Functions and procedures are named by the argument types of their signature
+        if object_type in ('Functions', 'Procedures'):
+            signatures = [parse_signature(arguments) for db, schema, arguments in schema_objects]
+            names = [signature.label() for signature in signatures]
+        else:
+            signatures = [None] * len(schema_objects)
+            names = [name for db, schema, name in schema_objects]
+        formatted_names = format_identifiers(names)
+
+        # Object headers by (database, schema), so each schema is formatted
+        # and its header emitted only once, across pages when given
+        if object_headers is None:
+            object_headers = {}
+        object_type = intern(object_type)
+        for (db, schema, _), name, formatted_name, signature in zip(schema_objects, names, formatted_names, signatures):
+            object_header = object_headers.get((db, schema))
+            if object_header is None:
+                formatted_schema = intern(f'{format_repeated_identifier(db)}.{format_repeated_identifier(schema)}')
+                object_header = SchemaObject(
+                    object_type,
+                    formatted_schema,
+                    intern(f'{formatted_schema}.{object_type}'),
+                    "object_header"
+                )
+                object_headers[(db, schema)] = object_header
+                if add_object_header:
+                    schema_object_list.append(object_header)
 
             schema_object_list.append(
-                {
-                    "parent": f"{formatted_db}.{formatted_schema}.{object_type}",
-                    "name": name,
-                    "formatted_name": f'{formatted_db}.{formatted_schema}.{formatted_name}',
-                    "object_type": object_type
-                }
+                SchemaObject(
+                    name,
+                    object_header.formatted_name,
+                    f'{object_header.parent}.{formatted_name}',
+                    object_type,
+                    signature
+                )
             )
         return schema_object_list
 
-    def format_identifier(self, id):
-        ''' Quote format the identifier if needed.
-            Unquoted identifiers:
-                a. Start with letter A-Z or an underscore (_)
-                b. Contain only letters A-Z, underscores, digits 0-9, and dollar signs ($)
-                c. To use the double quote character (") inside a quoted identifier, use two quotes.
-        '''
-        unquoted_ok = True
-        unquoted_intials = ascii_uppercase + '_'
-        unquoted_characters = set(unquoted_intials + digits + '$')
-
-        id_initial = id[0]
-        id_characters = set(id)
-        if id_initial not in unquoted_intials:
-            unquoted_ok = False     # rule a.
-        elif id_characters - unquoted_characters:
-            unquoted_ok = False     # rule b.
-
-        if unquoted_ok:
-            return id
-        else:
-            return f'''"{id.replace('"','""')}"'''  # rule c.
+    def get_metadata_columns(self, object_type):
+        ''' Get database name column, result columns, and row condition for SHOW output '''
 
-    def get_metadata(self, object_type, scope):
-        ''' Get requested database metadata from Snowflake '''
-        
-        # Set database name column, and filter for functions and procedures
+        # Set database name column, and condition for functions and procedures
         if object_type in ('Functions', 'Procedures'):
             dbname = 'catalog_name'
-            filter = """ WHERE "is_builtin" = 'N'"""
+            condition = """"is_builtin" = 'N'"""
         else:
             dbname = 'database_name'
-            filter = ''
+            condition = 'TRUE'
 
         # Build parameters for results SQL
         if object_type == 'Databases':
@@ -163,67 +746,401 @@ class Model:
         elif object_type == 'Schemas':
             column_list = '"database_name", "name"'
         elif object_type in ('Functions', 'Procedures'):
-            column_list = f'''"{dbname}", "schema_name", REGEXP_REPLACE("arguments", ' RETURN .*', '') as "name"'''
+            column_list = f'"{dbname}", "schema_name", "arguments" as "name"'
         else:
             column_list = f'"{dbname}", "schema_name", "name"'
-        
+
+        return dbname, column_list, condition
+
+    def get_show_command(self, object_type, scope, start=None, like=None):
+        ''' Build SHOW command for one page of objects, following the start name if given,
+            or for all objects named like if given '''
+        if like is not None:
+            # Names are not unique across a scope, so objects sharing one name
+            # are listed together, up to the row limit of unpaged SHOW output
+            return f'SHOW TERSE {object_type} LIKE {quote_string(escape_like(like))} IN {scope}'
+        command = f'SHOW TERSE {object_type} IN {scope} LIMIT {self.show_page_size}'
+        if start is not None:
+            command += f' FROM {quote_string(start)}'
+        return command
+
+    def get_page_select(self, column_list, condition, source):
+        ''' Build SELECT over a page of SHOW output in source, adding its last name, row count, and row condition '''
+        return f"""
+                SELECT {column_list}, "page_name", "page_rows", {condition} as "keep"
+                FROM (
+                    SELECT *, max("name") over () as "page_name", count(*) over () as "page_rows"
+                    FROM {source}
+                )"""
+
+    def get_metadata_page(self, object_type, rows, previous_rows):
+        ''' Split page rows into (metadata, last name, SHOW row count, new row count, row keys) '''
+        metadata = []
+        last_name = None
+        page_rows = 0
+        new_rows = 0
+        row_keys = set()
+        for *columns, last_name, page_rows, keep in rows:
+            row_key = tuple(columns)
+            row_keys.add(row_key)
+
+            # Objects sharing the last name of the previous page may be repeated
+            if row_key in previous_rows:
+                continue
+            new_rows += 1
+            if keep:
+                if object_type == 'Databases':
+                    metadata.append(columns[0])
+                else:
+                    metadata.append(row_key)
+        return metadata, last_name, page_rows, new_rows, row_keys
+
+    def get_batched_metadata(self, metadata_types, scope, cursor=None):
+        ''' Get metadata for several object types from a single anonymous block, paging past the SHOW limit '''
+        if cursor is None:
+            cursor = self.mcursor
+
+        # Capture the query id of each SHOW command and union the first page
+        # of results, tagged with the object type, into a single result set
+        declarations = ''
+        statements = ''
+        selects = []
+        for position, object_type in enumerate(metadata_types):
+            query_id = f'query_id_{position}'
+            dbname, column_list, condition = self.get_metadata_columns(object_type)
+            if object_type == 'Databases':
+                column_list = 'NULL as "database_name", NULL as "schema_name", "name"'
+            elif object_type == 'Schemas':
+                column_list = '"database_name", NULL as "schema_name", "name"'
+            elif dbname != 'database_name':
+                column_list = column_list.replace(f'"{dbname}"', f'"{dbname}" as "database_name"', 1)
+            column_list = f"""'{object_type}' as "object_type", {column_list}"""
+            declarations += f"""
+            {query_id} varchar;"""
+            statements += f"""
+            {self.get_show_command(object_type, scope)};
+            {query_id} := SQLID;"""
+            selects.append(self.get_page_select(column_list, condition, f'TABLE(RESULT_SCAN(:{query_id}))'))
+        union = """
+                UNION ALL""".join(selects)
+
         # Build and execute query
         query = f"""
         declare
-            res resultset;
-        begin
-            SHOW TERSE {object_type} IN {scope};
-            res := (SELECT {column_list} FROM TABLE(RESULT_SCAN(LAST_QUERY_ID())) {filter} ORDER BY "name");
+            res resultset;{declarations}
+        begin{statements}
+            res := ({union}
+                ORDER BY "name"
+            );
             return table (res);
         end;
         """
-        self.dcursor.execute(query)
+        rows = self.run_metadata_query(self.fetch_rows, cursor, query, kind='batched')
 
-        # Extract and return results
-        if object_type == 'Databases':
-            metadata = [row['name'] for row in self.dcursor]
-        elif object_type == 'Schemas':
-            metadata = [
-                    [row[dbname],
-                    row['name']]
-                for row in self.dcursor]
-        else:
-            metadata = [
-                    [row[dbname],
-                    row['schema_name'],
-                    row['name']]
-                for row in self.dcursor]
+        # Split unioned results back into per type page rows
+        rows_by_type = {object_type: [] for object_type in metadata_types}
+        for object_type, db, schema, name, *page_columns in rows:
+            if object_type == 'Databases':
+                rows_by_type[object_type].append((name, *page_columns))
+            elif object_type == 'Schemas':
+                rows_by_type[object_type].append((db, name, *page_columns))
+            else:
+                rows_by_type[object_type].append((db, schema, name, *page_columns))
+
+        # Page on through object types that filled their first page
+        metadata = {}
+        scripting = self.strategies['scripting']
+        for object_type, rows in rows_by_type.items():
+            metadata[object_type], last_name, page_rows, new_rows, row_keys = self.get_metadata_page(
+                object_type, rows, set())
+            if page_rows >= self.show_page_size:
+                for page in scripting.iter_pages(object_type, scope, cursor, last_name, row_keys):
+                    metadata[object_type] += page
 
         return metadata
 
-    def run_query(self, query):
-        ''' Submit query to Snowflake and return formatted output '''
+    def iter_metadata_pages(self, object_type, scope, cursor=None, start=None, previous_rows=None):
+        ''' Yield requested database metadata from Snowflake a page at a time, using the strategy for the scope level '''
+        if cursor is None:
+            cursor = self.mcursor
+        yield from self.get_strategy(scope).iter_pages(object_type, scope, cursor, start, previous_rows)
+
+    def run_metadata_query(self, function, *args, kind=None):
+        ''' Call an idempotent metadata query function in a concurrency slot, retrying transient failures;
+            the limiter compares latency among queries of the same kind '''
+        def attempt():
+            with self.limiter.slot(kind):
+                return function(*args)
+        return self.resilience.call(attempt)
+
+    def fetch_rows(self, cursor, query):
+        ''' Execute query and fetch all result rows '''
+        cursor.execute(query)
+        return cursor.fetchall()
+
+    def get_strategy(self, scope):
+        ''' Get the metadata strategy for the scope level '''
+        scope_level = scope.split(' ', 1)[0]
+        return self.strategies[self.strategy_by_level.get(scope_level, self.default_strategy)]
+
+    def benchmark_strategies(self):
+        ''' Time each metadata strategy at each scope level, save the fastest per level, and return a report '''
+        cursor = self.cnxn.cursor()
+        try:
+            results = []
+            for scope in self.get_benchmark_scopes(cursor):
+                results += self.benchmark_scope(scope, cursor)
+        except Exception as e:
+            results.append(['', '', '', e.__repr__()])
+        finally:
+            cursor.close()
+        return self.format_benchmark_results(results)
+
+    def benchmark_scope(self, scope, cursor):
+        ''' Time each metadata strategy listing everything in scope, and save the fastest for its level '''
+        scope_level = scope.split(' ', 1)[0]
+        node_level = 'Root' if scope_level == 'ACCOUNT' else scope_level
+        results = []
+        timings = {}
+        for name, strategy in self.strategies.items():
+            start = time.perf_counter()
+            try:
+                for object_type in self.get_metadata_types(node_level):
+                    for page in strategy.iter_pages(object_type, scope, cursor):
+                        pass
+            except Exception as e:
+                results.append([scope, name, '', e.__repr__()])
+                continue
+            timings[name] = time.perf_counter() - start
+            results.append([scope, name, f'{timings[name]:.2f}', ''])
+
+        # Remember the fastest strategy for the scope level
+        if timings:
+            fastest = min(timings, key=timings.get)
+            self.strategy_by_level[scope_level] = fastest
+            self.cache.put_strategy(self.account, self.role, scope_level, fastest)
+            for result in results:
+                if result[1] == fastest:
+                    result[3] = 'fastest'
+        return results
+
+    def get_benchmark_scopes(self, cursor):
+        ''' Get the account, its first database, and that database's first schema as benchmark scopes '''
+        scopes = ['ACCOUNT']
+        databases = self.strategies['scripting'].iter_pages('Databases', 'ACCOUNT', cursor)
+        database = next((db for page in databases for db in page), None)
+        if database is not None:
+            formatted_db = format_identifier(database)
+            scopes.append(f'Database {formatted_db}')
+            schemas = self.strategies['scripting'].iter_pages('Schemas', f'Database {formatted_db}', cursor)
+            schema = next((
+                schema for page in schemas for db, schema in page
+                if schema != 'INFORMATION_SCHEMA'
+            ), None)
+            if schema is not None:
+                scopes.append(f'Schema {formatted_db}.{format_identifier(schema)}')
+        return scopes
+
+    def get_metadata(self, object_type, scope, cursor=None):
+        ''' Get requested database metadata from Snowflake '''
+        metadata = []
+        for page in self.iter_metadata_pages(object_type, scope, cursor):
+            metadata += page
+        return metadata
+
+    def format_benchmark_results(self, results):
+        ''' Format strategy benchmark results as a Markdown table '''
+        output = pt.PrettyTable(['Scope', 'Strategy', 'Seconds', 'Result'])
+        output.add_rows(results)
+        output.set_style(pt.MARKDOWN)
+        output.align = "l"
+        output.align['Seconds'] = "r"
+        return output
+
+    def submit_query(self, query):
+        ''' Submit query to Snowflake without waiting for it to finish, and return its query id '''
+        # User queries may not be idempotent, so they are never retried
+        self.resilience.call(self.cursor.execute_async, query, retry=False)
+        self.running_queries.add(self.cursor.sfqid)
+        return self.cursor.sfqid
+
+    def cancel_query(self, query_id):
+        ''' Cancel a submitted query by query id '''
+        cursor = self.cnxn.cursor()
+        try:
+            self.resilience.call(cursor.execute, f"select system$cancel_query({quote_string(query_id)})")
+        finally:
+            cursor.close()
+        self.running_queries.discard(query_id)
+
+    def wait_for_query(self, query_id):
+        ''' Block until the submitted query is no longer queued or running, polling its status '''
+        poll_interval = self.min_poll_interval
+        while self.cnxn.is_still_running(self.resilience.call(self.cnxn.get_query_status, query_id)):
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, self.max_poll_interval)
+
+    def iter_query_output(self, query_id):
+        ''' Fetch results of a finished query in batches, yielding (formatted batch, rows fetched so far) '''
+        self.running_queries.discard(query_id)
+        self.result_store, batches = self.fetch_result(query_id, self.result_format, self.cursor)
+        self.result_query_id = query_id
+
+        # Column widths, set by the first batch so later batches line up with it
+        widths = {field_name: len(field_name) for field_name in self.result_store.field_names}
+
+        # Header only on the first batch, which is empty if there are no rows
+        header = True
+        for batch in batches:
+            rows = self.result_store.batch_rows(batch)
+            yield self.format_result_rows(self.result_store, rows, widths, header), self.result_store.num_rows
+            header = False
+        if header:
+            yield self.format_result_rows(self.result_store, [], widths, header), 0
+
+    def fetch_result(self, query_id, result_format, cursor):
+        ''' Get a result store for a finished query, and an iterator fetching its batches into the store '''
+        self.resilience.call(cursor.get_results_from_sfqid, query_id, retry=False)
+        columns = cursor.description
+        field_names = [column.name for column in columns]
+        numeric_fields = [column.name for column in columns if column.precision]
+
+        if result_format == 'arrow':
+            try:
+                tables = cursor.fetch_arrow_batches()
+            except (snowflake.connector.errors.NotSupportedError, snowflake.connector.errors.ProgrammingError):
+                # Result is not in Arrow format, or the connector lacks Arrow support
+                pass
+            else:
+                result_store = ArrowResultStore(field_names, numeric_fields)
+                return result_store, result_store.fetch(tables, self.fetch_batch_size)
+
+        result_store = ResultStore(field_names, numeric_fields)
+        return result_store, result_store.fetch(cursor, self.fetch_batch_size)
+
+    def format_result_rows(self, result_store, rows, widths, header):
+        ''' Format rows as Markdown table rows using pretty table; the first batch, formatted with its
+            header, sets column widths, and longer values in later batches are truncated to fit '''
+        field_names = result_store.field_names
+        if header:
+            for row in rows:
+                for field_name, value in zip(field_names, row):
+                    widths[field_name] = max(widths[field_name], len(str(value)))
+        else:
+            rows = [
+                [self.fit_value(value, widths[field_name]) for field_name, value in zip(field_names, row)]
+                for row in rows
+            ]
+
+        output_table = pt.PrettyTable(field_names)
+        output_table.add_rows(rows)
+        output_table.set_style(pt.MARKDOWN)
+        output_table.min_width = dict(widths)
+
+        # Default to left aligned columns
+        output_table.align = "l"
+        for field_name in result_store.numeric_fields:
+            # Right align numeric columns
+            output_table.align[field_name] = "r"
+
+        return output_table.get_string(header=header)
+
+    def fit_value(self, value, width):
+        ''' Get the value, or its text truncated with an ellipsis if wider than width '''
+        text = str(value)
+        if len(text) <= width:
+            return value
+        return text[:width - 1] + '…'
+
+    def benchmark_result_formats(self):
+        ''' Fetch and render the last query result as row tuples and as Arrow batches, and return a report '''
+        if self.result_query_id is None:
+            return 'Run a query to benchmark result formats on its result'
+        cursor = self.cnxn.cursor()
+        try:
+            results = []
+            for result_format in ['rows', 'arrow']:
+                if result_format == 'arrow' and not ARROW_AVAILABLE:
+                    results.append([result_format, '', '', '', '', '', 'pyarrow is not installed'])
+                    continue
+                try:
+                    results.append(self.benchmark_result_format(self.result_query_id, result_format, cursor))
+                except Exception as e:
+                    results.append([result_format, '', '', '', '', '', e.__repr__()])
+        finally:
+            cursor.close()
+        return self.format_result_benchmark(results)
+
+    def benchmark_result_format(self, query_id, result_format, cursor):
+        ''' Time fetching, converting, and rendering a query result in one format, and measure the memory it holds '''
+        result_store, batches = self.fetch_result(query_id, result_format, cursor)
+        widths = {field_name: len(field_name) for field_name in result_store.field_names}
+
+        # Row tuples are converted by the connector while fetching, and
+        # Arrow batches by the store when their rows are rendered
+        fetch_seconds = convert_seconds = render_seconds = 0.0
+        header = True
+        batches = iter(batches)
+        while True:
+            lap = time.perf_counter()
+            batch = next(batches, None)
+            fetch_seconds += time.perf_counter() - lap
+            if batch is None:
+                break
+
+            lap = time.perf_counter()
+            rows = result_store.batch_rows(batch)
+            convert_seconds += time.perf_counter() - lap
+
+            lap = time.perf_counter()
+            self.format_result_rows(result_store, rows, widths, header)
+            render_seconds += time.perf_counter() - lap
+            header = False
+
+        stored_format = 'arrow' if isinstance(result_store, ArrowResultStore) else 'rows'
+        return [
+            stored_format,
+            f'{result_store.num_rows:,}',
+            f'{fetch_seconds:.2f}',
+            f'{convert_seconds:.2f}',
+            f'{render_seconds:.2f}',
+            f'{result_store.nbytes() / 2 ** 20:.1f}',
+            '' if stored_format == result_format else f'{result_format} not supported for this result'
+        ]
+
+    def format_result_benchmark(self, results):
+        ''' Format result format benchmark results as a Markdown table '''
+        output = pt.PrettyTable(['Format', 'Rows', 'Fetch Seconds', 'Convert Seconds', 'Render Seconds', 'Stored MB', 'Result'])
+        output.add_rows(results)
+        output.set_style(pt.MARKDOWN)
+        output.align = "l"
+        for field_name in ['Rows', 'Fetch Seconds', 'Convert Seconds', 'Render Seconds', 'Stored MB']:
+            output.align[field_name] = "r"
+        return output
+
+    def get_query_details(self, query_id):
+        ''' Get id and duration of a finished query '''
+        return {
+            "query_id"       : query_id,
+            "query_duration" : self.query_duration(query_id),
+            "query_error"    : False
+        }
+
+    def get_error_output(self, error, query_id=''):
+        ''' Format an error raised while running a query as output '''
         query_details = {
-            "query_id"       : '',
+            "query_id"       : query_id,
             "query_duration" : '',
-            "query_error"    : False
+            "query_error"    : True
         }
-        try:
-            self.cursor.execute(query)
-            output = pt.from_db_cursor(self.cursor)
-
-            # Format output as Markdown table using pretty table
-            output.set_style(pt.MARKDOWN)
-            output.align = "l"
-            for column in self.cursor.description:
-                if column.precision:
-                    output.align[column.name] = "r"
-
-            query_details['query_id'] = self.cursor.sfqid
-            query_details['query_duration'] = self.query_duration()
-        except Exception as e:
-            query_details['query_error'] = True
-            output = e.__repr__()
+        if isinstance(error, CircuitOpenError):
+            output = str(error)
+        else:
+            output = error.__repr__()
         return((output, query_details))
 
-    def query_duration(self):
-        ''' Get duration of last execute query '''
-        query_id = self.cursor.sfqid
+    def query_duration(self, query_id):
+        ''' Get duration of the query '''
         sql = f"""
             select
                 to_varchar(
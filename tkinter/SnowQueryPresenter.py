@@ -1,12 +1,54 @@
+import queue
 import threading
+import time
 
 class Presenter:
-    def __init__(self, model, view):
+    def __init__(self, model, view, lazy_load=False):
         ''' Connect presenter to model and view '''
         self.model = model
         self.view = view
         self.view.set_presenter(self)
 
+        # Load database and schema children only when first expanded
+        self.lazy_load = lazy_load
+
+        # Tree updates queued by tree building threads and drained on the
+        # Tk main loop in time slices of drain_time_slice seconds
+        self.tree_queue = queue.Queue()
+        self.tree_loads = 0
+        self.drain_time_slice = 0.02
+        self.drain_interval = 10
+        self.inserted_nodes = 0
+        self.insert_time = 0.0
+        self.load_start = 0.0
+
+        # First error that stopped a tree building thread during the load
+        self.load_error = None
+
+        # Object type folders show folder_page_size objects at a time; the
+        # rest are held behind a "Load more..." node until it is selected
+        self.folder_page_size = 1000
+        self.folder_counts = {}
+        self.folder_limits = {}
+        self.held_nodes = {}
+
+        # User queries run on a worker thread, which queues batches of output
+        # for the Tk main loop to pick up every query_poll_interval ms; the
+        # queue is bounded so fetching slows down to the pace of rendering
+        self.query_queue = queue.Queue(maxsize=16)
+        self.query_poll_interval = 100
+        self.query_start = None
+
+        # Query id of the running query and whether it should be cancelled,
+        # shared with the query thread under query_lock
+        self.query_lock = threading.Lock()
+        self.running_query_id = ""
+        self.cancel_requested = False
+
+        # Benchmarks also run on a worker thread, which queues the report
+        self.benchmark_queue = queue.Queue()
+        self.benchmark_running = False
+
     def refresh_tree(self, node=''):
         ''' Prune and rebuild tree '''
         tree = self.view.tree
@@ -24,7 +66,7 @@ class Presenter:
             scope = "ACCOUNT"
         elif node_level in ("Database", "Schema"):
             scope = f"{node_level} {node}"
-        elif node_level != "leaf":
+        elif node_level not in ("leaf", "placeholder", "more"):
             scope = f"Schema {node_parent}"
 
         # Continue if valid scope identified
@@ -32,11 +74,14 @@ class Presenter:
             if node:
                 status = "Refreshing..."
                 tree.delete(*tree.get_children(node))
+                self.forget_folders(node)
             else:
                 status = "Loading databases..."
                 tree.delete(*tree.get_children())
+                self.forget_folders()
 
             self.view.set_status_bar(status)
+            self.start_tree_load()
 
             # Start thread to build database tree
             threading.Thread(
@@ -46,33 +91,247 @@ class Presenter:
             ).start()
     
     def build_tree(self, node_level, scope):
-        ''' Retrieve database metadata from Snowflake and build tree below node '''
+        ''' Retrieve database metadata from Snowflake and queue tree updates below node '''
+        try:
+            # Show cached snapshot of the tree while it is revalidated
+            cached_object_list = None
+            if node_level == "Root":
+                cached_object_list = self.model.get_cached_schema_object_list(
+                    node_level, scope, self.lazy_load)
+                if cached_object_list:
+                    self.queue_nodes(cached_object_list)
+                    self.tree_queue.put(('status', 'Revalidating...'))
 
-        schema_object_list = self.model.get_schema_object_list(node_level, scope)
+            if cached_object_list:
+                schema_object_list = self.model.refresh_schema_object_list(
+                    node_level, scope, self.lazy_load)
 
+                # Rebuild tree if the snapshot is out of date
+                if schema_object_list != cached_object_list:
+                    self.tree_queue.put(('clear',))
+                    self.queue_nodes(schema_object_list)
+            else:
+                # Grow tree as each object type arrives
+                batches = self.model.iter_refreshed_schema_object_list(
+                    node_level, scope, self.lazy_load)
+                for object_type, position, total, nodes in batches:
+                    self.tree_queue.put((
+                        'status',
+                        f'Loading {object_type} {position}/{total} ({self.model.limiter.status()})'
+                    ))
+                    self.queue_nodes(nodes)
+        except Exception as e:
+            # Report the failure instead of leaving a silently half-built tree
+            self.tree_queue.put(('error', f'Error loading tree: {e}'))
+        finally:
+            self.tree_queue.put(('done',))
+
+    def queue_nodes(self, schema_object_list):
+        ''' Queue schema objects for insertion into tree '''
         for schema_object in schema_object_list:
-            parent = schema_object["parent"]
-            name = schema_object["name"]
-            formatted_name = schema_object["formatted_name"]
-            object_type = schema_object["object_type"]
+            name, parent, formatted_name, object_type, signature = schema_object
             if object_type == "object_header":
                 node_level = name
             elif object_type in self.model.object_types:
                 node_level = "leaf"
             else:
                 node_level = object_type
-            self.view.tree.insert(
-                parent=parent,
-                index='end',
-                text=name,
-                iid=formatted_name,
-                values=(node_level,)
-            )
+            description = signature.arguments() if signature else ""
+            self.tree_queue.put(('node', parent, formatted_name, name, node_level, description))
+
+            # Add placeholder child so the node can be expanded
+            if self.lazy_load and node_level in ("Database", "Schema"):
+                self.tree_queue.put((
+                    'node',
+                    formatted_name,
+                    f"{formatted_name}.<placeholder>",
+                    "Loading...",
+                    "placeholder",
+                    ""
+                ))
+
+    def start_tree_load(self):
+        ''' Start draining queued tree updates on the Tk main loop '''
+        if not self.tree_loads:
+            self.inserted_nodes = 0
+            self.insert_time = 0.0
+            self.load_start = time.perf_counter()
+            self.load_error = None
+            self.view.window.after(self.drain_interval, self.drain_tree_queue)
+        self.tree_loads += 1
+
+    def drain_tree_queue(self):
+        ''' Apply queued tree updates for one time slice, then yield to the main loop '''
+        tree = self.view.tree
+        load_finished = False
+        start = time.perf_counter()
+        try:
+            while time.perf_counter() - start < self.drain_time_slice:
+                try:
+                    update = self.tree_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if update[0] == 'node':
+                    self.insert_node(*update[1:])
+                elif update[0] == 'clear':
+                    tree.delete(*tree.get_children())
+                    self.forget_folders()
+                elif update[0] == 'status':
+                    self.view.set_status_bar(update[1])
+                elif update[0] == 'error':
+                    self.load_error = self.load_error or update[1]
+                elif update[0] == 'done':
+                    self.tree_loads -= 1
+                    load_finished = not self.tree_loads
+        finally:
+            self.insert_time += time.perf_counter() - start
+            if load_finished:
+                self.report_tree_load()
+            if self.tree_loads or not self.tree_queue.empty():
+                self.view.window.after(self.drain_interval, self.drain_tree_queue)
+
+    def insert_node(self, parent, formatted_name, name, node_level, description):
+        ''' Insert node into tree, holding objects past the folder limit behind a "Load more..." node '''
+        tree = self.view.tree
+        if node_level == "leaf":
+            count = self.folder_counts.get(parent, 0)
+            if count >= self.folder_limits.get(parent, self.folder_page_size):
+                held_nodes = self.held_nodes.setdefault(parent, [])
+                if not held_nodes:
+                    tree.insert(
+                        parent=parent,
+                        index='end',
+                        text="Load more...",
+                        iid=f"{parent}.<more>",
+                        values=("more",)
+                    )
+                held_nodes.append((parent, formatted_name, name, node_level, description))
+                return
+            self.folder_counts[parent] = count + 1
+        tree.insert(
+            parent=parent,
+            index='end',
+            text=name,
+            iid=formatted_name,
+            values=(node_level, description)
+        )
+        self.inserted_nodes += 1
+
+    def load_more(self, node):
+        ''' Replace a "Load more..." node with the next page of held objects '''
+        tree = self.view.tree
+        parent = tree.parent(node)
+        tree.delete(node)
+        self.folder_limits[parent] = self.folder_counts[parent] + self.folder_page_size
+        for held_node in self.held_nodes.pop(parent, []):
+            self.insert_node(*held_node)
+        remaining = len(self.held_nodes.get(parent, []))
+        if remaining:
+            tree.item(f"{parent}.<more>", text=f"Load more... ({remaining:,} more)")
+
+    def forget_folders(self, node=''):
+        ''' Forget folder counts and held objects under node, or everywhere '''
+        for folders in (self.folder_counts, self.folder_limits, self.held_nodes):
+            if node:
+                for parent in [
+                    parent for parent in folders
+                    if parent == node or parent.startswith(f"{node}.")
+                ]:
+                    del folders[parent]
+            else:
+                folders.clear()
+
+    def report_tree_load(self):
+        ''' Report tree load time and insertion throughput, or the load error, in the status bar '''
+        if self.load_error:
+            self.view.set_status_bar(self.load_error)
+            return
+        elapsed = time.perf_counter() - self.load_start
+        rate = self.inserted_nodes / self.insert_time if self.insert_time else 0
+        status = (
+            f'Ready - {self.inserted_nodes:,} nodes in {elapsed:.2f}s '
+            f'({rate:,.0f} nodes/s inserted)'
+        )
+        resilience_status = self.model.resilience.status()
+        if resilience_status:
+            status += f' - {resilience_status}'
+        self.view.set_status_bar(status)
+
+    def expand_node(self, event=None):
+        ''' Load children of a lazily loaded node on first expand '''
+        tree = self.view.tree
+        node = tree.focus()
+        children = tree.get_children(node)
+        if len(children) == 1 and tree.item(children[0])['values'][0] == "placeholder":
+            self.refresh_tree(node)
+
+    def select_node(self, event=None):
+        ''' Load more objects when a "Load more..." node is selected, or describe the selected object '''
+        tree = self.view.tree
+        node = tree.focus()
+        if not node:
+            return
+        values = tree.item(node)['values']
+        if values[0] == "more":
+            self.load_more(node)
+        elif len(values) > 1 and values[1]:
+            self.view.set_status_bar(values[1])
+
+    def benchmark_strategies(self):
+        ''' Time each metadata strategy in the background and show the results '''
+        self.start_benchmark('Benchmarking metadata strategies...', self.model.benchmark_strategies)
+
+    def start_benchmark(self, status, benchmark):
+        ''' Run benchmark on a worker thread, keeping the main loop responsive '''
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status_bar('A query or benchmark is already running')
+            return
+        self.benchmark_running = True
+        self.view.set_status_bar(status)
+        threading.Thread(
+            target=self.run_benchmark,
+            args=(benchmark,),
+            daemon=True
+        ).start()
+        self.view.window.after(self.query_poll_interval, self.poll_benchmark)
 
+    def run_benchmark(self, benchmark):
+        ''' Run benchmark and queue its report; runs on a worker thread '''
+        try:
+            output = benchmark()
+        except Exception as e:
+            output = f'Benchmark failed: {e!r}'
+        self.benchmark_queue.put(output)
+
+    def poll_benchmark(self):
+        ''' Show the benchmark report once it is queued '''
+        try:
+            output = self.benchmark_queue.get_nowait()
+        except queue.Empty:
+            self.view.window.after(self.query_poll_interval, self.poll_benchmark)
+            return
+        self.benchmark_running = False
+        self.view.set_output_values(
+            {
+                "OUTPUT": output,
+                "QUERYID": "",
+                "QUERYDURATION" : ""
+            },
+            False
+        )
         self.view.set_status_bar('Ready')
 
+    def benchmark_result_formats(self):
+        ''' Time the last query result in each result format in the background and show the results '''
+        self.start_benchmark('Benchmarking result formats...', self.model.benchmark_result_formats)
+
     def submit_query(self, event=None):
-        ''' Submit query and return output '''
+        ''' Submit query to run in the background; its output is shown as it is fetched '''
+
+        # Run one query or benchmark at a time
+        if self.query_start is not None or self.benchmark_running:
+            self.view.set_status_bar('A query or benchmark is already running')
+            return
 
         query = self.view.query_box.get("1.0", "end")
         if query:
@@ -86,17 +345,85 @@ class Presenter:
                 False
             )
 
-            # Execute query and return output
-            output, query_details = self.model.run_query(query)
-
-            # Display query output
-            self.view.set_output_values(
-                {
-                    "OUTPUT": output,
-                    "QUERYID": query_details['query_id'],
-                    "QUERYDURATION" : query_details['query_duration']
-                },
-                query_details['query_error']
-            )
+            # Execute query on a worker thread, keeping the main loop responsive
+            self.query_start = time.perf_counter()
+            self.running_query_id = ""
+            self.cancel_requested = False
+            threading.Thread(
+                target=self.run_query,
+                args=(query,),
+                daemon=True
+            ).start()
+            self.view.window.after(self.query_poll_interval, self.poll_query)
         else:
             self.show_help(self.run_event)
+
+    def run_query(self, query):
+        ''' Submit query, wait for it, and queue its output a batch at a time; runs on a worker thread '''
+        query_id = ""
+        try:
+            query_id = self.model.submit_query(query)
+            with self.query_lock:
+                self.running_query_id = query_id
+                cancel = self.cancel_requested
+            if cancel:
+                self.model.cancel_query(query_id)
+            self.model.wait_for_query(query_id)
+            for output, rows_fetched in self.model.iter_query_output(query_id):
+                self.query_queue.put(('rows', output, rows_fetched))
+            output, query_details = "", self.model.get_query_details(query_id)
+        except Exception as e:
+            output, query_details = self.model.get_error_output(e, query_id)
+        self.query_queue.put(('done', output, query_details))
+
+    def cancel_query(self, event=None):
+        ''' Cancel the running query, as soon as it has a query id '''
+        if self.query_start is None:
+            return
+        with self.query_lock:
+            self.cancel_requested = True
+            query_id = self.running_query_id
+        self.view.set_status_bar('Cancelling query...')
+        if query_id:
+            threading.Thread(
+                target=self.send_cancel,
+                args=(query_id,),
+                daemon=True
+            ).start()
+
+    def send_cancel(self, query_id):
+        ''' Ask Snowflake to cancel the query; runs on a worker thread '''
+        try:
+            self.model.cancel_query(query_id)
+        except Exception as e:
+            self.query_queue.put(('status', f'Cancel failed: {e}'))
+        else:
+            self.query_queue.put(('status', 'Query cancelled'))
+
+    def poll_query(self):
+        ''' Append output of the running query for one time slice, and show its elapsed time '''
+        start = time.perf_counter()
+        while time.perf_counter() - start < self.drain_time_slice:
+            try:
+                update = self.query_queue.get_nowait()
+            except queue.Empty:
+                break
+            if update[0] == 'status':
+                self.view.set_status_bar(update[1])
+            elif update[0] == 'rows':
+                output, rows_fetched = update[1:]
+                self.view.append_output(output, False)
+                self.view.set_status_bar(f'{rows_fetched:,} rows fetched')
+            elif update[0] == 'done':
+                output, query_details = update[1:]
+                self.query_start = None
+
+                # Display query id and duration, or the error
+                self.view.set_query_progress(query_details['query_id'], query_details['query_duration'])
+                if output:
+                    self.view.append_output(output, query_details['query_error'])
+                return
+
+        elapsed = time.strftime('%H:%M:%S', time.gmtime(time.perf_counter() - self.query_start))
+        self.view.set_query_progress(self.running_query_id, elapsed)
+        self.view.window.after(self.query_poll_interval, self.poll_query)
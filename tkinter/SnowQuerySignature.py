@@ -0,0 +1,98 @@
+import re
+from typing import NamedTuple
+
+# Separates the argument list from the return type in SHOW arguments
+RETURN_CLAUSE = ' RETURN '
+
+# Marks an optional argument in SHOW arguments
+DEFAULT_PREFIX = 'DEFAULT '
+
+# Quoted or unquoted argument name followed by its type
+ARGUMENT_NAME = re.compile(r'("(?:[^"]|"")*"|[^\s"]+)\s+')
+
+class Signature(NamedTuple):
+    ''' Name, argument types, and return type of a function or procedure '''
+    name: str
+    argument_types: tuple
+    return_type: str
+    required_arguments: int
+
+    def label(self):
+        ''' Get the name and argument types as listed by SHOW, such as MY_FUNC(NUMBER, DEFAULT VARCHAR) '''
+        arguments = [
+            argument_type if position < self.required_arguments else DEFAULT_PREFIX + argument_type
+            for position, argument_type in enumerate(self.argument_types)
+        ]
+        return f"{self.name}({', '.join(arguments)})"
+
+    def arguments(self):
+        ''' Get the signature in the form of the SHOW arguments column '''
+        return f'{self.label()}{RETURN_CLAUSE}{self.return_type}'
+
+def split_arguments(argument_list):
+    ''' Split an argument list on commas outside parentheses and quotes '''
+    arguments = []
+    depth = 0
+    quoted = False
+    start = 0
+    for position, character in enumerate(argument_list):
+        if character == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif character == '(':
+            depth += 1
+        elif character == ')':
+            depth -= 1
+        elif character == ',' and not depth:
+            arguments.append(argument_list[start:position].strip())
+            start = position + 1
+    if argument_list.strip():
+        arguments.append(argument_list[start:].strip())
+    return arguments
+
+def drop_argument_name(argument):
+    ''' Drop the leading, possibly quoted, argument name from "NAME TYPE" '''
+    match = ARGUMENT_NAME.match(argument)
+    if match is None:
+        return argument
+    return argument[match.end():]
+
+def parse_signature(arguments, named=False):
+    ''' Parse the SHOW arguments of a function or procedure, such as MY_FUNC(NUMBER) RETURN VARCHAR,
+        or NAME(ARG TYPE, ...) RETURN TYPE with argument names if named '''
+    label, _, return_type = arguments.partition(RETURN_CLAUSE)
+
+    # The argument list runs from the parenthesis matching the closing one
+    close = label.rfind(')')
+    start = -1
+    depth = 0
+    for position in range(close, -1, -1):
+        if label[position] == ')':
+            depth += 1
+        elif label[position] == '(':
+            depth -= 1
+            if not depth:
+                start = position
+                break
+    if close < 0 or start < 0:
+        return Signature(label, (), return_type, 0)
+
+    argument_types = []
+    required_arguments = 0
+    for argument in split_arguments(label[start + 1:close]):
+        if named:
+            argument = drop_argument_name(argument)
+        if argument.startswith(DEFAULT_PREFIX):
+            argument = argument[len(DEFAULT_PREFIX):]
+        else:
+            required_arguments = len(argument_types) + 1
+        argument_types.append(argument)
+    return Signature(label[:start], tuple(argument_types), return_type, required_arguments)
+
+def load_signature(signature):
+    ''' Rebuild a signature loaded from JSON, or None '''
+    if signature is None:
+        return None
+    name, argument_types, return_type, required_arguments = signature
+    return Signature(name, tuple(argument_types), return_type, required_arguments)
@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+
+class MetadataStrategy(ABC):
+    ''' Way of listing the objects of one type under a scope, a page of SHOW output at a time '''
+    name = ''
+
+    def __init__(self, model):
+        ''' Attach strategy to the model whose paging settings and SQL builders it uses '''
+        self.model = model
+
+    def iter_pages(self, object_type, scope, cursor, start=None, previous_rows=None):
+        ''' Yield metadata a page at a time until SHOW output is exhausted, following the start name
+            if given; previous_rows holds keys of rows already listed '''
+        # Keys of every row listed so far, as name groups and pages overlap
+        listed_rows = set() if previous_rows is None else set(previous_rows)
+
+        first_page = True
+        while True:
+            if start is not None:
+                # A page continues after the last name of the previous one, which
+                # other databases, schemas, or overloads may share beyond the
+                # page limit; list every object of that name first
+                rows = self.run_page_query(object_type, scope, cursor, like=start)
+                metadata, last_name, page_rows, new_rows, row_keys = self.model.get_metadata_page(
+                    object_type, rows, listed_rows)
+                listed_rows |= row_keys
+                if metadata:
+                    yield metadata
+
+            rows = self.run_page_query(object_type, scope, cursor, start=start)
+            metadata, start, page_rows, new_rows, row_keys = self.model.get_metadata_page(
+                object_type, rows, listed_rows)
+            listed_rows |= row_keys
+            if metadata or first_page:
+                yield metadata
+            first_page = False
+
+            # Stop when SHOW output is exhausted, or when a page brings nothing
+            # new because more than a page of objects share one name
+            if page_rows < self.model.show_page_size or not new_rows:
+                break
+
+    def run_page_query(self, object_type, scope, cursor, start=None, like=None):
+        ''' Get rows of one page in a concurrency slot, retrying transient failures '''
+        return self.model.run_metadata_query(
+            self.get_page_rows, object_type, scope, cursor, start, like,
+            kind=(object_type, scope.split(' ', 1)[0])
+        )
+
+    @abstractmethod
+    def get_page_rows(self, object_type, scope, cursor, start, like=None):
+        ''' Get rows of one page, in column list order followed by the page columns '''
+
+class ScriptingStrategy(MetadataStrategy):
+    ''' SHOW in an anonymous block, reshaped server-side with RESULT_SCAN '''
+    name = 'scripting'
+
+    def get_page_rows(self, object_type, scope, cursor, start, like=None):
+        ''' Get rows of one page from an anonymous block '''
+        dbname, column_list, condition = self.model.get_metadata_columns(object_type)
+        select = self.model.get_page_select(column_list, condition, 'TABLE(RESULT_SCAN(LAST_QUERY_ID()))')
+        query = f"""
+        declare
+            res resultset;
+        begin
+            {self.model.get_show_command(object_type, scope, start, like)};
+            res := ({select}
+                ORDER BY "name"
+            );
+            return table (res);
+        end;
+        """
+        cursor.execute(query)
+        return cursor.fetchall()
+
+class PipeStrategy(MetadataStrategy):
+    ''' SHOW piped into a SELECT with the ->> operator '''
+    name = 'pipe'
+
+    def get_page_rows(self, object_type, scope, cursor, start, like=None):
+        ''' Get rows of one page from a piped SHOW '''
+        dbname, column_list, condition = self.model.get_metadata_columns(object_type)
+        select = self.model.get_page_select(column_list, condition, '$1')
+        query = f"""
+        {self.model.get_show_command(object_type, scope, start, like)}
+        ->> {select}
+                ORDER BY "name"
+        """
+        cursor.execute(query)
+        return cursor.fetchall()
+
+class ShowStrategy(MetadataStrategy):
+    ''' Plain SHOW, with columns picked, filtered, and sorted client-side '''
+    name = 'show'
+
+    def get_page_rows(self, object_type, scope, cursor, start, like=None):
+        ''' Get rows of one page from SHOW output '''
+        cursor.execute(self.model.get_show_command(object_type, scope, start, like))
+        columns = {column[0]: position for position, column in enumerate(cursor.description)}
+        show_rows = cursor.fetchall()
+        page_rows = len(show_rows)
+        page_name = max((row[columns['name']] for row in show_rows), default=None)
+
+        rows = []
+        for row in show_rows:
+            if object_type == 'Databases':
+                rows.append((row[columns['name']], page_name, page_rows, True))
+            elif object_type == 'Schemas':
+                rows.append((row[columns['database_name']], row[columns['name']], page_name, page_rows, True))
+            elif object_type in ('Functions', 'Procedures'):
+                rows.append((
+                    row[columns['catalog_name']],
+                    row[columns['schema_name']],
+                    row[columns['arguments']],
+                    page_name,
+                    page_rows,
+                    row[columns['is_builtin']] == 'N'
+                ))
+            else:
+                rows.append((
+                    row[columns['database_name']],
+                    row[columns['schema_name']],
+                    row[columns['name']],
+                    page_name,
+                    page_rows,
+                    True
+                ))
+        rows.sort(key=lambda row: row[-4])
+        return rows
@@ -98,6 +98,12 @@ class View:
         menu_file.entryconfigure('Quit', accelerator='Control-Q')
         self.window.bind('<Control-q>', quit)
 
+        # Tools menu
+        menu_tools = tk.Menu(master=menu_bar)
+        menu_bar.add_cascade(menu=menu_tools, label='Tools')
+        menu_tools.add_command(label='Benchmark Metadata Strategies', underline=0, command=self.benchmark_strategies)
+        menu_tools.add_command(label='Benchmark Result Formats', underline=10, command=self.benchmark_result_formats)
+
         # Help menu
         menu_help = tk.Menu(master=menu_bar, name='help')
         menu_bar.add_cascade(menu=menu_help, label='Help')
@@ -163,6 +169,17 @@ class View:
             widget=self.run_button,
             text="Run (F5)"
         )
+        self.cancel_button = tk.Button(
+            master=right_header,
+            fg=self.snow_fg,
+            text="■",
+            width=1
+        )
+        self.cancel_button.pack(side='right')
+        Tooltip(
+            widget=self.cancel_button,
+            text="Cancel (Esc)"
+        )
 
         self.toggle_theme_switch = tk.Button(
             master=right_header,
@@ -275,7 +292,11 @@ class View:
         self.refresh_button.configure(command=self.presenter.refresh_tree
         )
         self.run_button.configure(command=self.presenter.submit_query)
+        self.tree.bind('<<TreeviewOpen>>', self.presenter.expand_node)
+        self.tree.bind('<<TreeviewSelect>>', self.presenter.select_node)
         self.window.bind('<F5>', self.presenter.submit_query)
+        self.cancel_button.configure(command=self.presenter.cancel_query)
+        self.window.bind('<Escape>', self.presenter.cancel_query)
         self.presenter.refresh_tree()
         self.new_file()
         self.window.mainloop()
@@ -306,6 +327,19 @@ class View:
         ''' Set status bar '''
         self.status_bar_var.set(status)
 
+    def set_query_progress(self, query_id, elapsed):
+        ''' Show query id and elapsed time of the running query '''
+        self.query_id_var.set(query_id)
+        self.query_duration_var.set(elapsed)
+
+    def append_output(self, output, error):
+        ''' Append a batch of query output '''
+        if error:
+            self.output_box.config(fg="red")
+        self.output_box.config(state='normal')
+        self.output_box.insert(index="end", chars=f"{output}\n")
+        self.output_box.config(state='disabled')
+
     def set_output_values(self, output_values, error):
         ''' Output query results, query id, and query duration '''
         if error:
@@ -330,6 +364,14 @@ class View:
             # Set dark theme
             self.toggle_theme_switch.config(image=self.dark_img)
 
+    def benchmark_strategies(self):
+        ''' Benchmark metadata strategies '''
+        self.presenter.benchmark_strategies()
+
+    def benchmark_result_formats(self):
+        ''' Benchmark result formats '''
+        self.presenter.benchmark_result_formats()
+
     def refresh_tree_node(self):
         ''' Refresh tree under the selected node '''
         node = self.tree.selection()[0]